@@ -53,7 +53,8 @@ class DemodulationDialog(QDialog):
             "Fading": QPushButton("Fading", self),
             "Freq Drift": QPushButton("Freq Drift", self),
             "Freq Offset": QPushButton("Freq Offset", self),
-            "Delay": QPushButton("Delay", self)
+            "Delay": QPushButton("Delay", self),
+            "Multipath": QPushButton("Multipath", self)
         }
 
         for name, button in self.channel_buttons.items():
@@ -123,6 +124,18 @@ class DemodulationDialog(QDialog):
         fading_layout.addWidget(self.rician_input_layout)
         self.conditional_inputs["K value"] = self.rician_input_layout
 
+        self.doppler_input_layout = self.create_input_layout("Max Doppler:", "Optional max Doppler shift (Hz), empty for per-sample fading")
+        self.doppler_input_layout.hide()  # Hidden until a fading type is selected
+        fading_layout.addWidget(self.doppler_input_layout)
+        self.conditional_inputs["Doppler"] = self.doppler_input_layout
+
+        # Multipath Profile Input
+        self.multipath_selection = QComboBox(self)
+        self.multipath_selection.setStyleSheet(self.fading_selection.styleSheet())
+        self.multipath_selection.addItems(["Select Multipath Profile", "EPA", "EVA", "ETU"])
+        self.multipath_selection.setFont(font)
+        self.conditional_inputs["Multipath"] = self.multipath_selection
+
         # Freq Drift Input
         self.conditional_inputs["Freq Drift"] = self.create_input_layout("Freq Drift Rate:", "Enter drift rate (Hz/sample)")
 
@@ -130,7 +143,7 @@ class DemodulationDialog(QDialog):
         self.conditional_inputs["Freq Offset"] = self.create_input_layout("Freq Offset:", "Enter freq offset (Hz)")
 
         # Delay Input
-        self.conditional_inputs["Delay"] = self.create_input_layout("Delay:", "Enter delay (samples fraction)")
+        self.conditional_inputs["Delay"] = self.create_input_layout("Delay:", "Enter delay (samples)")
 
         # Add all conditional inputs to the scroll layout
         for widget in self.conditional_inputs.values():
@@ -360,12 +373,18 @@ class DemodulationDialog(QDialog):
     def handle_fading_selection(self, selection):
         if "Fading" not in self.selected_channels:
             self.rician_input_layout.hide()  # Ensure it stays hidden if "Fading" is not selected
+            self.doppler_input_layout.hide()
             return
         
         if selection == "Rician":
             self.rician_input_layout.show()
         else:
             self.rician_input_layout.hide()
+        
+        if selection in ("Rician", "Rayleigh"):
+            self.doppler_input_layout.show()
+        else:
+            self.doppler_input_layout.hide()
     
     def handle_plot_iq_checkbox(self, state):
         """Handle state change for Plot IQ checkbox."""
@@ -408,8 +427,10 @@ class DemodulationDialog(QDialog):
                         text =  widget.currentText().strip()
                     if (input_field and input_field.text().strip()):
                         channel_params[channel] = float(input_field.text().strip())
-                    elif text and text != "Select Fading Type":
+                    elif text and text not in ("Select Fading Type", "Select Multipath Profile"):
                         channel_params[channel] = text
+                    elif channel == "Doppler":
+                        continue  # Optional, empty keeps the independent per-sample fading model
                     else:
                         self.display_message(f"Error: Please enter a valid value for {channel}.")
                         return
@@ -419,11 +440,15 @@ class DemodulationDialog(QDialog):
             
             file_path = self.file_path
 
-            sampling_rate, signal = Demodulator.readfile(file_path)
+            sampling_rate, signal = Demodulator.readfile_mmap(file_path)
             
+            # Carrier and exact sampling rate from the file, older files fall back to a 10x oversampled carrier
+            metadata = Demodulator.readmetadata(file_path)
+            sampling_rate = metadata.get('sampling_rate', sampling_rate)
 
-            # Initialize Demodulator
-            demodulator = Demodulator(mode, bit_rate, sampling_rate)
+            # Initialize Demodulator, storage halving of the mapped file is undone in the matched filter
+            demodulator = Demodulator(mode, bit_rate, sampling_rate, carrier_freq=metadata.get('carrier_freq'))
+            demodulator.input_gain = 2
             demodulator.plot_IQ = self.plot_iq
             demodulator.plot_constellation = self.plot_constellation
 
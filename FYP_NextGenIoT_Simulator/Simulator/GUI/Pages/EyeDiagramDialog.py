@@ -79,7 +79,8 @@ class EyeDiagramDialog(QDialog):
             "Fading": QPushButton("Fading", self),
             "Freq Drift": QPushButton("Freq Drift", self),
             "Freq Offset": QPushButton("Freq Offset", self),
-            "Delay": QPushButton("Delay", self)
+            "Delay": QPushButton("Delay", self),
+            "Multipath": QPushButton("Multipath", self)
         }
 
         for name, button in self.channel_buttons.items():
@@ -149,6 +150,18 @@ class EyeDiagramDialog(QDialog):
         fading_layout.addWidget(self.rician_input_layout)
         self.conditional_inputs["K value"] = self.rician_input_layout
 
+        self.doppler_input_layout = self.create_input_layout("Max Doppler:", "Optional max Doppler shift (Hz), empty for per-sample fading")
+        self.doppler_input_layout.hide()  # Hidden until a fading type is selected
+        fading_layout.addWidget(self.doppler_input_layout)
+        self.conditional_inputs["Doppler"] = self.doppler_input_layout
+
+        # Multipath Profile Input
+        self.multipath_selection = QComboBox(self)
+        self.multipath_selection.setStyleSheet(self.fading_selection.styleSheet())
+        self.multipath_selection.addItems(["Select Multipath Profile", "EPA", "EVA", "ETU"])
+        self.multipath_selection.setFont(font)
+        self.conditional_inputs["Multipath"] = self.multipath_selection
+
         # Freq Drift Input
         self.conditional_inputs["Freq Drift"] = self.create_input_layout("Freq Drift Rate:", "Enter drift rate (Hz/sample)")
 
@@ -156,7 +169,7 @@ class EyeDiagramDialog(QDialog):
         self.conditional_inputs["Freq Offset"] = self.create_input_layout("Freq Offset:", "Enter freq offset (Hz)")
 
         # Delay Input
-        self.conditional_inputs["Delay"] = self.create_input_layout("Delay:", "Enter delay (samples fraction) btw 0-1")
+        self.conditional_inputs["Delay"] = self.create_input_layout("Delay:", "Enter delay (samples)")
 
         # Add all conditional inputs to the scroll layout
         for widget in self.conditional_inputs.values():
@@ -436,12 +449,18 @@ class EyeDiagramDialog(QDialog):
     def handle_fading_selection(self, selection):
         if "Fading" not in self.selected_channels:
             self.rician_input_layout.hide()  # Ensure it stays hidden if "Fading" is not selected
+            self.doppler_input_layout.hide()
             return
         
         if selection == "Rician":
             self.rician_input_layout.show()
         else:
             self.rician_input_layout.hide()
+        
+        if selection in ("Rician", "Rayleigh"):
+            self.doppler_input_layout.show()
+        else:
+            self.doppler_input_layout.hide()
     def handle_constellation_checkbox(self, state):
             """Handle state change for Plot IQ checkbox."""
             self.plot_constellation = state == Qt.Checked
@@ -482,8 +501,10 @@ class EyeDiagramDialog(QDialog):
                         text =  widget.currentText().strip()
                     if (input_field and input_field.text().strip()):
                         channel_params[channel] = float(input_field.text().strip())
-                    elif text and text != "Select Fading Type":
+                    elif text and text not in ("Select Fading Type", "Select Multipath Profile"):
                         channel_params[channel] = text
+                    elif channel == "Doppler":
+                        continue  # Optional, empty keeps the independent per-sample fading model
                     else:
                         self.display_message(f"Error: Please enter a valid value for {channel}.")
                         return
@@ -493,10 +514,11 @@ class EyeDiagramDialog(QDialog):
             mode = self.selected_mode #selected demod
 
             modulator = Modulator(mode, bit_rate, carrier_freq)
-            demodulator = Demodulator(mode, bit_rate, modulator.sampling_rate)
+            # 32 samples per symbol keep the eye smooth without drawing every full rate sample
+            demodulator = Demodulator(mode, bit_rate, modulator.sampling_rate, output_samples_per_symbol=32)
             demodulator.plot_EyeDiagram = True #Set to true to plot eye diagram
             demodulator.plot_constellation = self.plot_constellation 
-            bitstr = modulator.msgchar2bit(message)
+            bitstr = modulator.msg2bits(message)
 
             t_axis, signal = modulator.modulate(bitstr)
 
@@ -343,7 +343,7 @@ class ModulationDialog(QDialog):
             modulator = Modulator(self.selected_mode, bit_rate, carrier_freq)
             modulator.IQ_Return = self.plot_iq
             modulator.save_signal = self.save_signal
-            bitstr = modulator.msgchar2bit(message)
+            bitstr = modulator.msg2bits(message)
             digital_signal, x_axis_digital = modulator.digitalsignal(bitstr)
 
             if modulator.IQ_Return == False:
@@ -78,7 +78,8 @@ class SNRBERDialog(QDialog):
             "Fading": QPushButton("Fading", self),
             "Freq Drift": QPushButton("Freq Drift", self),
             "Freq Offset": QPushButton("Freq Offset", self),
-            "Delay": QPushButton("Delay", self)
+            "Delay": QPushButton("Delay", self),
+            "Multipath": QPushButton("Multipath", self)
         }
 
         for name, button in self.channel_buttons.items():
@@ -148,6 +149,18 @@ class SNRBERDialog(QDialog):
         fading_layout.addWidget(self.rician_input_layout)
         self.conditional_inputs["K value"] = self.rician_input_layout
 
+        self.doppler_input_layout = self.create_input_layout("Max Doppler:", "Optional max Doppler shift (Hz), empty for per-sample fading")
+        self.doppler_input_layout.hide()  # Hidden until a fading type is selected
+        fading_layout.addWidget(self.doppler_input_layout)
+        self.conditional_inputs["Doppler"] = self.doppler_input_layout
+
+        # Multipath Profile Input
+        self.multipath_selection = QComboBox(self)
+        self.multipath_selection.setStyleSheet(self.fading_selection.styleSheet())
+        self.multipath_selection.addItems(["Select Multipath Profile", "EPA", "EVA", "ETU"])
+        self.multipath_selection.setFont(font)
+        self.conditional_inputs["Multipath"] = self.multipath_selection
+
         # Freq Drift Input
         self.conditional_inputs["Freq Drift"] = self.create_input_layout("Freq Drift Rate:", "Enter drift rate (Hz/sample)")
 
@@ -155,7 +168,7 @@ class SNRBERDialog(QDialog):
         self.conditional_inputs["Freq Offset"] = self.create_input_layout("Freq Offset:", "Enter freq offset (Hz)")
 
         # Delay Input
-        self.conditional_inputs["Delay"] = self.create_input_layout("Delay:", "Enter delay (samples fraction) btw 0-1")
+        self.conditional_inputs["Delay"] = self.create_input_layout("Delay:", "Enter delay (samples)")
 
         # Add all conditional inputs to the scroll layout
         for widget in self.conditional_inputs.values():
@@ -470,12 +483,18 @@ class SNRBERDialog(QDialog):
     def handle_fading_selection(self, selection):
         if "Fading" not in self.selected_channels:
             self.rician_input_layout.hide()  # Ensure it stays hidden if "Fading" is not selected
+            self.doppler_input_layout.hide()
             return
         
         if selection == "Rician":
             self.rician_input_layout.show()
         else:
             self.rician_input_layout.hide()
+        
+        if selection in ("Rician", "Rayleigh"):
+            self.doppler_input_layout.show()
+        else:
+            self.doppler_input_layout.hide()
             
     def run_simulation(self):
         self.display_message("Simulation started")
@@ -534,8 +553,10 @@ class SNRBERDialog(QDialog):
                         text =  widget.currentText().strip()
                     if (input_field and input_field.text().strip()):
                         channel_params[channel] = float(input_field.text().strip())
-                    elif text and text != "Select Fading Type":
+                    elif text and text not in ("Select Fading Type", "Select Multipath Profile"):
                         channel_params[channel] = text
+                    elif channel == "Doppler":
+                        continue  # Optional, empty keeps the independent per-sample fading model
                     else:
                         self.display_message(f"Error: Please enter a valid value for {channel}.")
                         return
@@ -1,6 +1,119 @@
-from numpy import sum, abs, sqrt, exp, pi, arange,sinc,hamming
-from scipy.signal import fftconvolve
-from numpy.random import normal, seed as nprseed
+from numpy import sum, abs, sqrt, exp, pi, arange,sinc,hamming,asarray,atleast_1d,atleast_2d,iscomplexobj,mean,hypot,cos,sin,rint,zeros,floor,zeros_like,concatenate
+from scipy.signal import fftconvolve, oaconvolve, hilbert
+from scipy.fft import fft
+from numpy.random import default_rng
+from .NCO import CarrierPhasor
+from functools import lru_cache
+
+DELAY_TAPS = 21      # Taps per fractional delay filter
+DELAY_PHASES = 1024  # Fractional delay resolution of the filter bank, 1/DELAY_PHASES sample
+
+JAKES_SINUSOIDS = 16     # Sinusoids per quadrature branch of the sum-of-sinusoids fading model
+JAKES_RATE_FACTOR = 32   # Fading process samples per Doppler period before interpolation
+
+# 3GPP TS 36.104 power delay profiles (NB-IoT/LTE): path delays in seconds and relative path powers in dB
+MULTIPATH_PROFILES = {
+    'EPA': ((0, 30e-9, 70e-9, 90e-9, 110e-9, 190e-9, 410e-9),
+            (0.0, -1.0, -2.0, -3.0, -8.0, -17.2, -20.8)),
+    'EVA': ((0, 30e-9, 150e-9, 310e-9, 370e-9, 710e-9, 1090e-9, 1730e-9, 2510e-9),
+            (0.0, -1.5, -1.4, -3.6, -0.6, -9.1, -7.0, -12.0, -16.9)),
+    'ETU': ((0, 50e-9, 120e-9, 200e-9, 230e-9, 500e-9, 1600e-9, 2300e-9, 5000e-9),
+            (-1.0, -1.0, -1.0, 0.0, 0.0, 0.0, -3.0, -5.0, -7.0)),
+}
+
+def JakesFadingProcess(doppler, sampling_rate, num_samples, rng, rows=1, num_sinusoids=JAKES_SINUSOIDS):
+    """
+    Generates unit power, time-correlated Rayleigh fading coefficients with the Clarke/Jakes Doppler spectrum.
+
+    Uses the sum-of-sinusoids model of Zheng and Xiao with random angles of arrival and phases. The process
+    is evaluated at about JAKES_RATE_FACTOR samples per Doppler period and linearly interpolated to the
+    sampling rate, so the cost grows with the Doppler frequency rather than with one draw per sample.
+
+    Parameters
+    ----------
+    doppler : float
+        Maximum Doppler frequency in Hz. 0 gives a static channel (one coefficient per row).
+
+    sampling_rate : float
+        Sampling Rate in Hz.
+
+    num_samples : int
+        Number of coefficients per row.
+
+    rng : numpy.random.Generator
+        Generator drawing the angles and phases.
+
+    rows : int
+        Number of independent realisations.
+
+    num_sinusoids : int
+        Sinusoids per quadrature branch.
+
+    Returns
+    ---------
+
+    h : 2-D ndarray of complex
+        (rows x num_samples) fading coefficients, E|h|^2 = 1.
+    """
+    num_samples = int(num_samples)
+    step = max(1, int(sampling_rate // (JAKES_RATE_FACTOR * doppler))) if doppler > 0 else max(1, num_samples)
+    t = arange(0, num_samples + step, step) / sampling_rate
+
+    n = arange(1, num_sinusoids + 1)
+    theta = rng.uniform(-pi, pi, (rows, 1))
+    phi, psi = rng.uniform(-pi, pi, (2, rows, num_sinusoids, 1))
+    alpha = ((2*pi*n - pi + theta) / (4*num_sinusoids))[..., None]
+
+    omega = 2 * pi * doppler * t
+    in_phase = cos(omega * cos(alpha) + phi).sum(axis=1)
+    quadrature = sin(omega * sin(alpha) + psi).sum(axis=1)
+    h_low = (in_phase + 1j * quadrature) / sqrt(num_sinusoids)
+
+    # Linear interpolation onto the sample grid, one (blocks x step) broadcast per row
+    fraction = arange(step) / step
+    h = h_low[:, :-1, None] + (h_low[:, 1:] - h_low[:, :-1])[..., None] * fraction
+    return h.reshape(rows, -1)[:, :num_samples]
+
+def FractionalDelayBank(num_taps=DELAY_TAPS, num_phases=DELAY_PHASES):
+    """
+    Hamming windowed sinc fractional delay filters for the delays 0, 1/num_phases, ..., 1 sample.
+
+    Row p delays by num_taps//2 + p/num_phases samples and has unity DC gain. The bank is computed once
+    per (num_taps, num_phases) and cached, the returned array is read-only. Cache statistics are available
+    from FractionalDelayBank.cache_info().
+
+    Parameters
+    ----------
+    num_taps : int
+        Taps per filter, odd.
+
+    num_phases : int
+        Number of fractional delay steps per sample.
+
+    Returns
+    ---------
+
+    bank : 2-D ndarray of floats
+        (num_phases+1 x num_taps) filter taps.
+    """
+    return _delay_bank(int(num_taps), int(num_phases))
+
+@lru_cache(maxsize=4)
+def _delay_bank(num_taps, num_phases):
+    fractions = arange(num_phases + 1)[:, None] / num_phases
+    bank = sinc(arange(num_taps) - num_taps//2 - fractions) * hamming(num_taps)
+    bank /= bank.sum(axis=1, keepdims=True)
+    bank.flags.writeable = False
+    return bank
+
+FractionalDelayBank.cache_info = _delay_bank.cache_info
+FractionalDelayBank.cache_clear = _delay_bank.cache_clear
+
+def _apply_complex_gain(signal, h):
+    # Real (passband) signals are scaled through their analytic signal so the result stays real
+    if iscomplexobj(signal):
+        return signal * h
+    return (hilbert(signal, axis=-1) * h).real
 
 class SimpleGWNChannel_dB:
     def __init__(self, SNR, seed=1):
@@ -9,13 +122,12 @@ class SimpleGWNChannel_dB:
 
         Parameters:
         - SNR (float): The Signal-to-Noise Ratio in decibels.
-        - seed (int, optional): The seed for the random number generator to ensure reproducibility. 
-        Defaults to 1. If None, no seeding is applied.
+        - seed (int, numpy.random.SeedSequence or numpy.random.Generator, optional): Seed of the channel's own
+        numpy.random.Generator, the global numpy random state is not touched. Defaults to 1. If None, the generator is seeded from the OS.
         """
         self.SNR = SNR
         self.seed = seed
-        if seed is not None:
-            nprseed(seed)
+        self.rng = default_rng(seed)
 
     def add_noise(self, signal):
         """
@@ -29,6 +141,7 @@ class SimpleGWNChannel_dB:
 
         The noise is generated using the SNR provided during the class initialization.
         The noise power is calculated based on the signal power and the SNR.
+        Complex (baseband) signals receive circular complex noise of the same total power.
         """
         signal_power = sum(abs(signal)**2) / len(signal)
         snr_linear = 10**(self.SNR/10)
@@ -36,64 +149,149 @@ class SimpleGWNChannel_dB:
         noise_power = signal_power / snr_linear
         noise_std_dev = sqrt(noise_power)
 
-        noise = normal(0, noise_std_dev, len(signal))
+        if iscomplexobj(signal):
+            noise = self.rng.normal(0, noise_std_dev / sqrt(2), (2, len(signal)))
+            return signal + noise[0] + 1j * noise[1]
+
+        noise = self.rng.normal(0, noise_std_dev, len(signal))
         return signal + noise
     
+class BatchGWNChannel_dB:
+    def __init__(self, SNRs, seed=1):
+        """
+        Initializes the BatchGWNChannel_dB class with a vector of SNRs and an optional random seed.
+
+        Parameters:
+        - SNRs (array-like of float): The Signal-to-Noise Ratios in decibels, one per output row.
+        - seed (int, numpy.random.SeedSequence or numpy.random.Generator, optional): Seed of the channel's own
+        numpy.random.Generator. Passing a Generator shares it, so consecutive channels continue one noise stream.
+        Defaults to 1. If None, the generator is seeded from the OS.
+        """
+        self.SNRs = atleast_1d(asarray(SNRs, dtype=float))
+        self.seed = seed
+        self.rng = default_rng(seed)
+
+    def add_noise(self, signal):
+        """
+        Adds Gaussian noise at every SNR to one clean signal.
+
+        Args:
+            signal (np.array): The 1-D clean signal.
+
+        Returns:
+            np.array: 2-D (n_snr x n_samples) block of noisy signals, row i at SNRs[i].
+
+        The signal power is computed once and the noise for all rows is drawn in a single generator call.
+        Complex signals receive circular complex noise of the same total power.
+        """
+        signal = asarray(signal)
+        signal_power = sum(abs(signal)**2) / len(signal)
+        noise_std_dev = sqrt(signal_power / 10**(self.SNRs/10))[:, None]
+
+        if iscomplexobj(signal):
+            noise = self.rng.standard_normal((2, len(self.SNRs), len(signal)))
+            noise = (noise[0] + 1j * noise[1]) * (noise_std_dev / sqrt(2))
+        else:
+            noise = self.rng.standard_normal((len(self.SNRs), len(signal)))
+            noise *= noise_std_dev
+
+        noise += signal
+        return noise
+
 class SimpleDelayChannel:
-    def __init__(self, delay):
+    def __init__(self, delay, drift=0.0):
         """
         Initializes the SimpleDelayChannel class with a specified delay.
 
         Parameters:
-        - delay (float): The fractional delay in samples that will be applied to the signal.
+        - delay (float): The delay in samples (integer plus fractional part) that will be applied to the signal, >= 0.
+        - drift (float, optional): Change of the delay per sample, e.g. 20e-6 for a 20 ppm clock offset. The delay of
+        sample n is delay + drift*n and must stay >= 0. Defaults to 0, a constant delay.
+
+        The filters come from the shared FractionalDelayBank, the fractional part is rounded to 1/DELAY_PHASES sample.
         """
-        assert delay > 0 and delay < 1
+        if delay < 0:
+            raise ValueError("Delay must be non-negative")
         self.delay = delay
+        self.drift = drift
+
+        # Integer shift and fractional delay filter of the constant delay
+        self.bank = FractionalDelayBank()
+        self.integer_delay = int(floor(delay))
+        self.taps = self.bank[int(rint((delay - self.integer_delay) * (len(self.bank) - 1)))]
 
     def add_delay(self, signal):
         """
-        Applies a fractional delay to the signal using a filter with
-        'hamming' window and 'sinc' taps.
+        Delays the signal using the 'hamming' windowed 'sinc' filter bank. The group delay of the filters is
+        compensated, so sample n of the output is sample n - delay of the input.
 
         Parameters:
-        - signal (numpy.array): The signal to be delayed.
+        - signal (numpy.array): 1-D signal, or 2-D (n_trials x n_samples) batch delayed along the last axis.
 
         Returns:
-        - numpy.array: The delayed signal.
-        """
-        # Create and apply fractional delay filter fractional delay, in signal
-        N = 21 # number of taps
-        n = arange(-N//2, N//2) # ...-3,-2,-1,0,1,2,3...
-        h = sinc(n - self.delay) # calc filter taps
-        h *= hamming(N) # window the filter to make sure it decays to 0 on both sides
-        h /= sum(h) # normalize to get unity gain, we don't want to change the amplitude/power
-        signal = fftconvolve(signal, h) # apply filter
-        return signal
+        - numpy.array: The delayed signal, same shape as the input. The first samples are zero.
+        """
+        signal = asarray(signal)
+        num_samples = signal.shape[-1]
+        center = len(self.taps) // 2
+
+        if self.drift == 0:
+            output = zeros_like(signal, dtype=float if not iscomplexobj(signal) else complex)
+            start = max(0, self.integer_delay - center)
+            if start < num_samples:
+                filtered = fftconvolve(signal, self.taps.reshape((1,) * (signal.ndim - 1) + (-1,)), axes=-1)
+                output[..., start:] = filtered[..., start + center - self.integer_delay:center - self.integer_delay + num_samples]
+            return output
+
+        # Time-varying delay: per sample integer shift and filter phase, one gather per tap
+        delays = self.delay + self.drift * arange(num_samples)
+        if delays.min() < 0:
+            raise ValueError("The drifting delay must stay non-negative")
+        integer_delays = floor(delays).astype(int)
+        phases = rint((delays - integer_delays) * (len(self.bank) - 1)).astype(int)
+
+        pad = integer_delays.max() + len(self.taps)
+        padded = concatenate([zeros(signal.shape[:-1] + (pad,), dtype=signal.dtype), signal,
+                              zeros(signal.shape[:-1] + (len(self.taps),), dtype=signal.dtype)], axis=-1)
+        index = arange(num_samples) - integer_delays + center + pad
+
+        output = zeros(signal.shape, dtype=float if not iscomplexobj(signal) else complex)
+        for tap in range(len(self.taps)):
+            output += self.bank[phases, tap] * padded[..., index - tap]
+        return output
     
 class SimpleFlatFadingChannel:
-    def __init__(self, type, seed=1):
+    def __init__(self, type, seed=1, doppler=None, rician_k=None, envelope_only=True):
         """
         Initializes the SimpleFlatFadingChannel class with a specified type and an optional random seed.
 
         Parameters:
         - type (str): The type of fading, either 'rayleigh' or 'rician'.
-        - seed (int, optional): The seed for the random number generator to ensure reproducibility. 
-        Defaults to 1. If None, no seeding is applied.
+        - seed (int, numpy.random.SeedSequence or numpy.random.Generator, optional): Seed of the channel's own
+        numpy.random.Generator, the global numpy random state is not touched. Defaults to 1. If None, the generator is seeded from the OS.
+        - doppler (float, optional): Maximum Doppler frequency in Hz of a time-correlated (Jakes) fading process.
+        Defaults to None, an independent coefficient per sample.
+        - rician_k (float, optional): Rician K-factor in dB. Can also be set through the `rician_k` attribute.
+        - envelope_only (bool, optional): Apply only the magnitude |h| of the Doppler fading process, as the legacy Rayleigh
+        model does, so results stay comparable with receivers without phase recovery. False applies the complex gain,
+        including its phase rotation. Defaults to True.
         """
         if type != "rayleigh" and type != "rician":
             raise ValueError("Invalid type, must be 'rayleigh' or 'rician'")
-        self.rician_k = None
+        self.rician_k = rician_k
+        self.doppler = doppler
+        self.envelope_only = envelope_only
         self.type = type
         self.seed = seed
-        if seed is not None:
-            nprseed(seed)
+        self.rng = default_rng(seed)
         
-    def add_fading(self, signal):      
+    def add_fading(self, signal, sampling_rate=None):      
         """
         Applies fading to the input signal based on the specified channel type.
 
         Parameters:
         - signal (np.array): The input signal to which the fading effect will be applied.
+        - sampling_rate (float, optional): Sampling rate of the signal, required when a Doppler frequency is set.
 
         Returns:
         - np.array: The signal with applied fading effect.
@@ -101,11 +299,27 @@ class SimpleFlatFadingChannel:
         The function supports two types of fading:
         1. Rayleigh Fading: A diffuse multipath component is applied, modeled as a complex Gaussian process without a line of sight component.
         2. Rician Fading: A combination of a line-of-sight component and a diffuse multipath component is applied, controlled by the Rician K-factor.
+
+        With a Doppler frequency the diffuse component is a JakesFadingProcess. By default only its envelope |h| scales
+        the signal. With envelope_only=False, real (passband) signals are faded through their analytic signal and stay
+        real, and complex (baseband) signals are multiplied directly.
         """
+        if self.doppler is not None:
+            if sampling_rate is None:
+                raise ValueError("sampling_rate is required for Doppler fading")
+            h = JakesFadingProcess(self.doppler, sampling_rate, len(signal), self.rng)[0]
+            if self.type == "rician":
+                assert self.rician_k is not None
+                linear_k = 10**(self.rician_k/10)
+                h = sqrt(linear_k / (linear_k + 1)) + sqrt(1 / (linear_k + 1)) * h
+            if self.envelope_only:
+                return signal * abs(h)
+            return _apply_complex_gain(signal, h)
+
         if self.type == "rayleigh":
             # Diffuse component (Rayleigh fading)
-            real = normal(0, 1, size=signal.shape)
-            imag = normal(0, 1, size=signal.shape)
+            real = self.rng.standard_normal(signal.shape)
+            imag = self.rng.standard_normal(signal.shape)
             h = sqrt(real**2 + imag**2) / sqrt(2)
                 
         elif self.type == "rician":
@@ -115,13 +329,107 @@ class SimpleFlatFadingChannel:
             los_component = sqrt(linear_k / (linear_k + 1))
             
             # Diffuse component (Rayleigh fading)
-            diffuse_component = (normal(0, 1, size=signal.shape) + 1j * normal(0, 1, size=signal.shape)) / sqrt(2)
+            diffuse_component = (self.rng.standard_normal(signal.shape) + 1j * self.rng.standard_normal(signal.shape)) / sqrt(2)
             
             # Rician fading: LOS + diffuse components
             h = los_component + sqrt(1 / (linear_k + 1)) * diffuse_component
             
         return signal * h
 
+class MultipathChannel:
+    def __init__(self, profile, sampling_rate, seed=1, derotate=True):
+        """
+        Initializes a tapped-delay-line multipath channel from a power delay profile.
+
+        The path delays are rounded to the sampling grid once, paths falling on the same sample are combined.
+        Every realization draws an independent complex Gaussian gain per path (block Rayleigh fading), the
+        average total power is normalised to 1.
+
+        Parameters:
+        - profile (str or tuple): Name of a profile in MULTIPATH_PROFILES ('EPA', 'EVA', 'ETU'), or a
+        (delays in seconds, path powers in dB) pair.
+        - sampling_rate (float): Sampling rate of the signals in Hz.
+        - seed (int, numpy.random.SeedSequence or numpy.random.Generator, optional): Seed of the channel's own
+        numpy.random.Generator. Defaults to 1. If None, the generator is seeded from the OS.
+        - derotate (bool, optional): Remove the random common phase of every realization at the signal's spectral peak in
+        `add_multipath`, which receivers without phase recovery cannot undo, as envelope_only does for flat fading.
+        False applies the raw complex taps. Defaults to True.
+        """
+        if isinstance(profile, str):
+            if profile.upper() not in MULTIPATH_PROFILES:
+                raise ValueError(f"Invalid multipath profile: {profile}, must be one of {list(MULTIPATH_PROFILES)}")
+            profile = MULTIPATH_PROFILES[profile.upper()]
+        delays, gains_db = (asarray(values, dtype=float) for values in profile)
+        if delays.shape != gains_db.shape or delays.min() < 0:
+            raise ValueError("Profile delays and gains must have the same length and the delays must be non-negative")
+        
+        self.delays = delays
+        self.gains_db = gains_db
+        self.sampling_rate = sampling_rate
+        self.derotate = derotate
+        self.seed = seed
+        self.rng = default_rng(seed)
+        
+        path_powers = 10**(gains_db/10)
+        self.tap_index = rint(delays * sampling_rate).astype(int)
+        self.path_gains = sqrt(path_powers / sum(path_powers))
+        self.num_taps = self.tap_index.max() + 1
+        self.taps = self.realization()
+
+    def realization(self, rng=None, rows=None):
+        """
+        Draws the tap vector of a new channel realization.
+
+        Parameters:
+        - rng (numpy.random.Generator, optional): Generator to draw from instead of the channel's own.
+        - rows (int, optional): Number of independent realizations. Defaults to None, a single 1-D tap vector.
+
+        Returns:
+        - np.array: Complex taps, (num_taps,) or (rows x num_taps).
+        """
+        rng = self.rng if rng is None else rng
+        shape = (1 if rows is None else rows, len(self.path_gains))
+        path_taps = (rng.standard_normal(shape) + 1j * rng.standard_normal(shape)) * (self.path_gains / sqrt(2))
+        
+        taps = zeros((shape[0], self.num_taps), dtype=complex)
+        for path, index in enumerate(self.tap_index):
+            taps[:, index] += path_taps[:, path]
+        return taps[0] if rows is None else taps
+
+    def add_multipath(self, signal, taps=None):
+        """
+        Passes the signal through the current realization with overlap-add FFT convolution.
+
+        Parameters:
+        - signal (np.array): 1-D signal, or 2-D (n_trials x n_samples) batch.
+        - taps (np.array, optional): Taps from `realization`, one row per signal row. Defaults to the `taps` attribute,
+        call `realization` to draw new ones.
+
+        Returns:
+        - np.array: The signal after the channel, same shape as the input (the delay spread tail is dropped). Real
+        (passband) signals are filtered through their analytic signal and stay real.
+        """
+        taps = self.taps if taps is None else taps
+        signal = asarray(signal)
+        analytic = signal if iscomplexobj(signal) else hilbert(signal, axis=-1)
+        if signal.ndim == 2:
+            taps = atleast_2d(taps)
+        if self.derotate:
+            taps = self._derotate(analytic, taps)
+        
+        output = oaconvolve(analytic, taps, axes=-1)[..., :signal.shape[-1]]
+        return output if iscomplexobj(signal) else output.real
+
+    @staticmethod
+    def _derotate(analytic, taps):
+        # The common phase is that of the channel gain at the spectral peak of each row (the carrier of passband
+        # signals), which white noise added before the channel does not move
+        rows = atleast_2d(analytic)
+        peak = abs(fft(rows, axis=-1)).argmax(axis=-1) / rows.shape[-1]
+        reference = sum(atleast_2d(taps) * exp(-2j * pi * peak[:, None] * arange(taps.shape[-1])), axis=-1)
+        rotation = reference.conj() / (abs(reference) + (reference == 0))
+        return taps * (rotation[:, None] if taps.ndim == 2 else rotation[0])
+
 class SimpleFrequencyDriftChannel:
     def __init__(self, frequency_drift_rate):
         """
@@ -167,11 +475,159 @@ class SimpleFrequencyOffsetChannel:
         Returns:
         - np.array: The signal with applied frequency offset.
         """
-        time = arange(0, len(signal), dtype=float) / sampling_rate
         # Apply frequency offset to the signal
-        signal = signal * exp(1j * 2 * pi * self.frequency_offset * time)
+        signal = signal * CarrierPhasor(self.frequency_offset, sampling_rate, len(signal))
         return signal
     
+class ChannelPipeline:
+    def __init__(self, selected_channels, channel_params, sampling_rate, seed=1):
+        """
+        Initializes a chain of channels that is built once and applied to many signals.
+
+        Everything that does not depend on the signal is computed here: the AWGN scaling, the Rician
+        line-of-sight and diffuse gains, the delay taps, and the drift and offset phasors (cached per signal
+        length on first use). `apply` then runs every stage in place on one buffer.
+
+        Parameters:
+        - selected_channels (list of str): List of channels to be applied to the signal.
+        - channel_params (dict): Dictionary of channel parameters, keys are the channel names. Stages are applied in
+        the order of this dictionary, as in ApplyChannels.
+        - sampling_rate (int): Sampling rate of the signals.
+        - seed (int, numpy.random.SeedSequence or numpy.random.Generator, optional): Seed of the pipeline's own
+        numpy.random.Generator, used by the AWGN and Fading stages. Defaults to 1. If None, the generator is seeded from the OS.
+
+        Supported channels are the ones of ApplyChannels. If a channel is not supported, a ValueError is raised.
+        """
+        self.selected_channels = selected_channels
+        self.sampling_rate = sampling_rate
+        self.seed = seed
+        self.rng = default_rng(seed)
+        
+        self.stages = []
+        self.complex_output = False  # Set by stages that turn a real signal complex
+        self._phasors = {}
+        
+        for channel, value in (channel_params.items() if selected_channels else ()):
+            match channel:
+                case "AWGN":
+                    self.stages.append((self._awgn, 1 / sqrt(10**(float(value)/10))))
+                case "Fading":
+                    fading_type = str(value).lower()
+                    if fading_type not in ("rayleigh", "rician"):
+                        raise ValueError("Invalid type, must be 'rayleigh' or 'rician'")
+                    if fading_type == "rician" and "K value" not in channel_params:
+                        raise ValueError("Rician fading requires a 'K value' parameter")
+                    
+                    if "Doppler" in channel_params:
+                        linear_k = 10**(float(channel_params["K value"])/10) if fading_type == "rician" else 0
+                        self.stages.append((self._doppler_fading, (float(channel_params["Doppler"]),
+                                                                   sqrt(linear_k / (linear_k + 1)), sqrt(1 / (linear_k + 1)),
+                                                                   bool(channel_params.get("Envelope Only", True)))))
+                    elif fading_type == "rayleigh":
+                        self.stages.append((self._rayleigh, None))
+                    else:
+                        linear_k = 10**(float(channel_params["K value"])/10)
+                        self.stages.append((self._rician, (sqrt(linear_k / (linear_k + 1)), sqrt(1 / (2 * (linear_k + 1))))))
+                        self.complex_output = True
+                case "Freq Drift":
+                    self.stages.append((self._phasor, ("Freq Drift", float(value))))
+                    self.complex_output = True
+                case "Freq Offset":
+                    self.stages.append((self._phasor, ("Freq Offset", float(value))))
+                    self.complex_output = True
+                case "Delay":
+                    self.stages.append((self._delay, SimpleDelayChannel(delay=float(value), drift=float(channel_params.get("Delay Drift", 0)))))
+                case "Multipath":
+                    derotate = bool(channel_params.get("Multipath Derotate", True))
+                    self.stages.append((self._multipath, MultipathChannel(str(value), sampling_rate, seed=None, derotate=derotate)))
+                case "K value" | "Doppler" | "Envelope Only" | "Delay Drift" | "Multipath Derotate":
+                    # Fading, delay and multipath parameters, handled above
+                    continue
+                case _:
+                    raise ValueError(f"Invalid channel: {channel}")
+
+    def apply(self, signal, rng=None, inplace=False):
+        """
+        Applies every stage of the pipeline to a signal or to a batch of signals.
+
+        Parameters:
+        - signal (np.array): 1-D signal, or 2-D (n_trials x n_samples) batch. Every row of a batch passes through
+        the same chain, the noise and fading of each row are independent and scaled to that row's power.
+        - rng (numpy.random.Generator, optional): Generator to draw from instead of the pipeline's own, e.g. one per sweep cell.
+        - inplace (bool, optional): Modify `signal` itself when its dtype allows it (complex, or real for a real chain).
+        Defaults to False, the input is copied once.
+
+        Returns:
+        - np.array: The signal with the applied channels, same shape as the input.
+        """
+        rng = self.rng if rng is None else rng
+        dtype = complex if self.complex_output or iscomplexobj(signal) else float
+        
+        buffer = asarray(signal)
+        if not (inplace and buffer.dtype == dtype and buffer.flags.writeable):
+            buffer = buffer.astype(dtype)
+        
+        block = atleast_2d(buffer)
+        for stage, params in self.stages:
+            block = stage(block, params, rng)
+        
+        return block if buffer.ndim == 2 else block[0]
+
+    def _awgn(self, block, scale, rng):
+        noise_std_dev = sqrt(mean(block.real**2 + block.imag**2 if iscomplexobj(block) else block**2, axis=-1, keepdims=True)) * scale
+        
+        if iscomplexobj(block):
+            noise_std_dev /= sqrt(2)
+            block.imag += rng.standard_normal(block.shape) * noise_std_dev
+            block.real += rng.standard_normal(block.shape) * noise_std_dev
+        else:
+            block += rng.standard_normal(block.shape) * noise_std_dev
+        return block
+
+    def _rayleigh(self, block, params, rng):
+        h = hypot(rng.standard_normal(block.shape), rng.standard_normal(block.shape))
+        h /= sqrt(2)
+        block *= h
+        return block
+
+    def _rician(self, block, params, rng):
+        los_component, diffuse_scale = params
+        h = rng.standard_normal(block.shape) + 1j * rng.standard_normal(block.shape)
+        h *= diffuse_scale
+        h += los_component
+        block *= h
+        return block
+
+    def _doppler_fading(self, block, params, rng):
+        doppler, los_component, diffuse_scale, envelope_only = params
+        h = JakesFadingProcess(doppler, self.sampling_rate, block.shape[-1], rng, rows=block.shape[0])
+        h *= diffuse_scale
+        h += los_component
+        if envelope_only:
+            block *= abs(h)
+        else:
+            block[...] = _apply_complex_gain(block, h)
+        return block
+
+    def _multipath(self, block, channel, rng):
+        block[...] = channel.add_multipath(block, channel.realization(rng, rows=block.shape[0]))
+        return block
+
+    def _phasor(self, block, params, rng):
+        key = (*params, block.shape[-1])
+        if key not in self._phasors:
+            channel, value = params
+            if channel == "Freq Drift":
+                self._phasors[key] = exp(1j * 2 * pi * value * arange(block.shape[-1]) / block.shape[-1])
+            else:
+                self._phasors[key] = CarrierPhasor(value, self.sampling_rate, block.shape[-1])
+        block *= self._phasors[key]
+        return block
+
+    def _delay(self, block, channel, rng):
+        block[...] = channel.add_delay(block)
+        return block
+
 def ApplyChannels(selected_channels, channel_params, signal, sampling_rate):
     """
     Applies a sequence of channels to the input signal based on the selected channels and parameters.
@@ -189,43 +645,17 @@ def ApplyChannels(selected_channels, channel_params, signal, sampling_rate):
     - AWGN
     - Fading (Rayleigh or Rician)
         - Rician requires K input
+        - Optional Doppler input (Hz) for time-correlated fading, envelope only unless "Envelope Only" is False
+    - Multipath (EPA, EVA or ETU profile)
+        - Common phase of each realization removed unless "Multipath Derotate" is False
     - Freq Drift
     - Freq Offset
-    - Delay
+    - Delay (samples, integer plus fraction)
+        - Optional Delay Drift input (samples per sample) for a time-varying delay
 
     If a channel is not supported, a ValueError is raised.
+
+    The channels are applied by a ChannelPipeline built for this call. To apply the same channels to many
+    signals build the ChannelPipeline once instead.
     """
-    if selected_channels:
-        for channel, value in channel_params.items():
-            match channel:
-                case "AWGN":
-                    AWGNChannel = SimpleGWNChannel_dB(SNR=value)
-                    signal = AWGNChannel.add_noise(signal)
-                    continue
-                case "Fading":
-                    FlatFadingChannel = SimpleFlatFadingChannel(type=str(value).lower())
-                    if value == "Rician":
-                        assert "K value" in channel_params
-                        FlatFadingChannel.rician_k = float(channel_params["K value"])
-                    signal = FlatFadingChannel.add_fading(signal)
-                    continue
-                case "Freq Drift":
-                    FreqDriftChannel = SimpleFrequencyDriftChannel(frequency_drift_rate=value)
-                    signal = FreqDriftChannel.add_drift(signal)
-                    continue
-                case "Freq Offset":
-                    FreqOffsetChannel = SimpleFrequencyOffsetChannel(frequency_offset=value)
-                    signal = FreqOffsetChannel.add_offset(signal, sampling_rate)
-                    continue
-                case "Delay":
-                    DelayChannel = SimpleDelayChannel(delay=value)
-                    signal = DelayChannel.add_delay(signal)
-                    continue
-                case "K value":
-                    # Case will only exist if Rician is selected but K is handled above
-                    continue
-                case _:
-                    raise ValueError(f"Invalid channel: {channel}")
-    
-        return signal
-    
\ No newline at end of file
+    return ChannelPipeline(selected_channels, channel_params, sampling_rate).apply(signal)
@@ -0,0 +1,118 @@
+import numpy as np
+import pickle
+from pathlib import Path
+from functools import cached_property
+from scipy import spatial as spysp
+
+# QAM_LUT_pkl directory, resolved relative to the package rather than the working directory
+QAM_LUT_DIR = Path(__file__).resolve().parents[2] / 'QAM_LUT_pkl'
+
+QAM_MODES = {'QAM16': 4, 'QAM64': 6, 'QAM256': 8, 'QAM1024': 10, 'QAM4096': 12}
+
+class QAMConstellation:
+    def __init__(self, modulation_mode, points):
+        """
+        Contiguous array form of a Gray-coded square QAM look up table.
+
+        Every array is indexed by the integer value of the symbol's bit label, so the point of
+        label '0110' is points[0b0110] and its bits are bits[0b0110].
+
+        Parameters:
+            modulation_mode (str): QAM mode, one of QAM16, QAM64, QAM256, QAM1024, QAM4096.
+            points (np.array): Complex un-normalised constellation points (odd integer grid) indexed by label.
+        """
+        self.modulation_mode = modulation_mode
+        self.order = QAM_MODES[modulation_mode]
+        self.size = 2**self.order
+        self.side = 2**(self.order//2)
+
+        #Constellation Points (un-normalised as in RQAM, unit average energy as in NQAM)
+        self.points = np.ascontiguousarray(points, dtype=complex)
+        self.scaler = (2/3*(self.size-1))**0.5
+        self.normalised_points = self.points.real / self.scaler + 1j*(self.points.imag / self.scaler)
+
+        #Bit Labels
+        self.labels = np.arange(self.size)
+        self.bits = np.ascontiguousarray(((self.labels[:, None] >> np.arange(self.order - 1, -1, -1)) & 1).astype(np.uint8))
+
+        #Slicer Table, label of the point in grid column i (I ascending) and row j (Q descending)
+        i_index = np.rint((self.points.real + self.side - 1) / 2).astype(np.intp)
+        j_index = np.rint((self.side - 1 - self.points.imag) / 2).astype(np.intp)
+        self.grid_labels = np.zeros(self.size, dtype=np.intp)
+        self.grid_labels[i_index * self.side + j_index] = self.labels
+
+    def slice(self, i_samples, q_samples):
+        """
+        Nearest point labels of un-normalised I/Q samples, found by rounding and clipping I and Q
+        independently onto the square grid. Equivalent to a nearest neighbour search for square QAM.
+
+        Parameters:
+            i_samples (np.array): In-phase samples on the un-normalised (odd integer) scale.
+            q_samples (np.array): Quadrature samples on the un-normalised (odd integer) scale.
+
+        Returns:
+            np.array: Bit labels of the nearest points, same shape as the samples.
+        """
+        i_index = np.clip(np.rint((i_samples + (self.side - 1)) / 2), 0, self.side - 1).astype(np.intp)
+        j_index = np.clip(np.rint(((self.side - 1) - q_samples) / 2), 0, self.side - 1).astype(np.intp)
+        return self.grid_labels[i_index * self.side + j_index]
+
+    @cached_property
+    def tree(self):
+        """
+        KDTree over the un-normalised points, built on first use. Tree indices are bit labels.
+        """
+        return spysp.KDTree(np.column_stack([self.points.real, self.points.imag]))
+
+# Process-wide registry, every table is loaded or generated once
+_registry = {}
+
+def get_constellation(modulation_mode):
+    """
+    Returns the QAMConstellation of a QAM mode, loading it from R{mode}.pkl on first use or
+    generating it if the pickle is not available.
+
+    Parameters:
+        modulation_mode (str): QAM mode, one of QAM16, QAM64, QAM256, QAM1024, QAM4096.
+    """
+    if modulation_mode not in _registry:
+        if modulation_mode not in QAM_MODES:
+            raise ValueError(f"Invalid QAM mode: {modulation_mode}")
+
+        lut_path = QAM_LUT_DIR / f'R{modulation_mode}.pkl'
+        if lut_path.exists():
+            points = _load_points(lut_path, QAM_MODES[modulation_mode])
+        else:
+            points = generate_points(QAM_MODES[modulation_mode])
+
+        _registry[modulation_mode] = QAMConstellation(modulation_mode, points)
+    return _registry[modulation_mode]
+
+def _load_points(lut_path, order):
+    with open(lut_path, 'rb') as file:
+        qam_const = pickle.load(file)
+
+    points = np.zeros(2**order, dtype=complex)
+    for (i, q), symbol in qam_const.items():
+        points[int(symbol, 2)] = i + 1j*q
+    return points
+
+def generate_points(order):
+    """
+    Generates the label indexed points of a Gray-coded square QAM constellation, identical to the
+    tables written by QAM_Generators.
+
+    Parameters:
+        order (int): Bits per symbol, even.
+    """
+    side = 2**(order//2)
+    I_values = np.arange(-side + 1, side, 2)
+    Q_values = I_values[::-1]
+
+    grid = np.arange(side)
+    gray = grid ^ (grid >> 1)
+
+    points = np.zeros(2**order, dtype=complex)
+    labels = (gray[:, None] << (order//2)) | gray[None, :]
+    points[labels] = I_values[:, None] + 1j*Q_values[None, :]
+    return points
@@ -1,15 +1,17 @@
 import numpy as np
 import scipy.signal as sig
-from scipy import spatial as spysp
 import scipy.io.wavfile as wav
-import matplotlib.pyplot as plt
 from .RRCFilter import RRCFilter
-import pickle
+from .ConstellationRegistry import get_constellation
+from .WavMetadata import read_metadata
+from .NCO import CarrierPhasor
+from .PulseShaping import DecimatingFilter
+from .DemodulationPlots import DemodulatorPlots
 
 
-class Demodulator:
+class Demodulator(DemodulatorPlots):
     modulation_modes = {'BPSK': 1, 'QPSK': 2, 'QAM16': 4, 'QAM64': 6, 'QAM256': 8, 'QAM1024': 10, 'QAM4096': 12}
-    def __init__(self, modulation_mode, bit_rate, sampling_rate) -> None: 
+    def __init__(self, modulation_mode, bit_rate, sampling_rate, baseband=False, carrier_freq=None, oversampling_factor=10, output_samples_per_symbol=None) -> None: 
         """
         Demodulator Class Initializer
 
@@ -17,6 +19,14 @@ class Demodulator:
             modulation_mode (str) : Modulation mode to be used for demodulation. Supported modes are BPSK, QPSK, QAM16, QAM64, QAM256, QAM1024, QAM4096
             bit_rate (float) : Bit rate of the signal to be demodulated
             sampling_rate (float) : Sampling rate of the signal to be demodulated
+            baseband (bool) : Complex baseband mode, the input is the complex envelope from a baseband Modulator.
+                Downconversion and low-pass filtering are skipped. Defaults to False.
+            carrier_freq (float) : Carrier frequency of the signal, e.g. from the WAV metadata (see `readmetadata`).
+                Defaults to None, i.e. sampling_rate/(2*oversampling_factor) for signals sampled at a multiple of the carrier.
+            oversampling_factor (int) : Oversampling of the carrier assumed when no carrier frequency is given. Defaults to 10.
+            output_samples_per_symbol (int) : Minimum samples per symbol of the demodulated output, e.g. 1 for the symbol rate
+                or 2. The output is decimated by the largest divisor of samples_per_symbol that keeps at least this many, with
+                the symbol decisions kept on the output grid. Defaults to None, i.e. full rate output for IQ and eye plots.
         """
         #Modulation Parameters
         self.modulation_mode = modulation_mode
@@ -25,30 +35,59 @@ class Demodulator:
         #Bit Rate Parameters
         self.baud_rate = bit_rate/self.order
         self.symbol_period = 1/self.baud_rate
-        self.oversampling_factor = 10
+        self.oversampling_factor = oversampling_factor
         self.sampling_rate = sampling_rate
         self.samples_per_symbol = int(self.sampling_rate/self.baud_rate)
         
         #Demodulation Parameters
-        self.carrier_freq = sampling_rate/(2*self.oversampling_factor)
+        self.baseband = baseband
+        if baseband:
+            self.carrier_freq = 0
+        elif carrier_freq is None:
+            self.carrier_freq = sampling_rate/(2*self.oversampling_factor)
+        else:
+            self.carrier_freq = carrier_freq
         self.demodulator_total_delay = None
 
+        #Output Grid Parameters (decimation of the demodulated output, symbol_step is its samples per symbol)
+        self.output_samples_per_symbol = output_samples_per_symbol
+        self.decimation = 1
+        self.decimation_phase = 0
+        self.symbol_step = self.samples_per_symbol
+
+        #Filtering Engine ('auto', 'polyphase' decimating FIR or 'fft')
+        self.filter_method = 'auto'
+
         #Filter Parameters
         self.Nyquist_Bandwidth = 1/(2*self.symbol_period)
         self.low_pass_filter_cutoff = 0.9*self.Nyquist_Bandwidth
+        # 77 taps at a 10x oversampled carrier, scaled with the sampling rate to keep the same span in carrier periods
         self.low_pass_filter_order = 77
-        self.low_pass_delay = (self.low_pass_filter_order // 2) / self.sampling_rate
+        if not baseband:
+            self.low_pass_filter_order = max(1, round(77*sampling_rate/(20*self.carrier_freq))) | 1
+        self.low_pass_delay = (self.low_pass_filter_order // 2) / self.sampling_rate if not baseband else 0
         self.low_pass_filter = self.low_pass_filter()
 
         #Plotting Parameters
         self.plot_IQ = False
         self.plot_constellation = False
         self.plot_EyeDiagram = False
-        self.fig = plt.figure('Demodulator', constrained_layout=True)
+        self.eye_mode = 'auto'          # 'lines', 'density' (2-D histogram) or 'auto'
+        self.eye_max_traces = 1000      # Traces above which 'auto' draws the eye as a density
+        self.constellation_max_points = 5000   # Symbols above which the constellation is drawn as a density
+        self.constellation_bins = 400          # Histogram bins per axis of the density constellation
+        self._fig = None  # Created on first use of `fig`, see DemodulatorPlots
         self.ax = None
         
         #RRC Filter Parameters
         self.RRC_alpha = 0.35
+
+        #QAM Demapper ('slicer' for square QAM, 'kdtree' nearest neighbour fallback)
+        self.demapper = 'slicer'
+
+        #Input Gain, folded into the matched filter gain (2 undoes the storage halving of memory-mapped WAV files)
+        self.input_gain = 1
+        
     @staticmethod
     def readfile(filename):
         '''
@@ -63,13 +102,67 @@ class Demodulator:
         rate, data = wav.read(filename)
         # Data * 2 to remove storage halving.
         return rate, data * 2
+
+    @staticmethod
+    def readmetadata(filename):
+        '''
+        Reads the carrier frequency, sampling rate and bit rate stored by `Modulator.save`.
+        
+        Parameters:
+            filename (str): The name of the .wav file to be read.
+        
+        Returns:
+            dict: The stored parameters, empty for files without metadata.
+        '''
+        return read_metadata(filename)
+
+    @staticmethod
+    def readfile_mmap(filename):
+        '''
+        Memory-maps the data chunk of a .wav file instead of reading it into memory.
+
+        The samples are returned as a zero-copy view still carrying the storage halving; set
+        `input_gain = 2` on the Demodulator to undo it inside the matched filter gain.
+        
+        Parameters:
+            filename (str): The name of the .wav file to be read.
+        
+        Returns:
+            tuple: A tuple containing the sample rate of the .wav file and a memory-mapped view of its data.
+        '''
+        return wav.read(filename, mmap=True)
+
+    @staticmethod
+    def readfile_blocks(filename, block_size=2**20):
+        '''
+        Iterates over a memory-mapped .wav file in blocks, to feed `demodulate_stream` with files larger than memory.
+        Storage halving is not undone, set `input_gain = 2` on the Demodulator.
+        
+        Parameters:
+            filename (str): The name of the .wav file to be read.
+            block_size (int): Number of samples per block.
+        
+        Yields:
+            np.array: Consecutive blocks of the file's samples, only one block is resident at a time.
+        '''
+        _, data = Demodulator.readfile_mmap(filename)
+        for start in range(0, len(data), block_size):
+            yield np.array(data[start:start + block_size])
     
-    def downconverter(self, signal):
-        t = np.linspace(0, len(signal)/self.sampling_rate, len(signal), endpoint=False)
-        baseband_signal = signal * np.exp(-1j* 2 *np.pi * self.carrier_freq * t)
+    def downconverter(self, signal, start_index=0):
+        baseband_signal = self.__mix(signal, start_index)
         I = baseband_signal.real
         Q = baseband_signal.imag
         return I, Q
+
+    def __mix(self, signal, start_index=0):
+        """
+            Mixes the received signal (last axis starting at absolute sample `start_index`) to complex baseband.
+            Baseband mode input is already the complex envelope.
+        """
+        if self.baseband:
+            return np.asarray(signal, dtype=complex)
+        return signal * CarrierPhasor(-self.carrier_freq, self.sampling_rate, signal.shape[-1], start_index)
     
     def low_pass_filter(self):
         low_pass_filter = sig.firwin(self.low_pass_filter_order, self.low_pass_filter_cutoff/(self.sampling_rate/2), fs = self.sampling_rate)
@@ -80,23 +173,63 @@ class Demodulator:
             Demodulates a signal to its baseband envelope.
 
             This function performs the following steps:
-                1. Downconversion and low-pass filtering to extract in-phase (I) and quadrature (Q) components.
-                2. Matched filtering using a root-raised-cosine (RRC) filter for optimal signal recovery.
-                3. Energy normalization and scaling based on the modulation order.
+                1. Downconversion to the complex baseband.
+                2. Low-pass and matched (root-raised-cosine) filtering, merged into one composite complex FIR
+                   with the energy normalization and modulation order scaling folded into its taps.
+                3. Decimation to `output_samples_per_symbol`, if set. The polyphase engine only computes the kept samples.
 
             Parameters:
-                signal (np.array): The input signal to be demodulated.
+                signal (np.array): The input signal to be demodulated. N-D inputs are processed along the last axis.
 
             Returns:
-                np.array: The baseband envelope of the demodulated signal after processing.
+                np.array: The baseband envelope of the demodulated signal after processing, `symbol_step` samples per symbol.
         """
 
-        ##### Downconversion & Lowpassing #####
-        I_base, Q_base = self.downconverter(signal)
-        I_lp = sig.lfilter(self.low_pass_filter, 1, I_base)
-        Q_lp = sig.lfilter(self.low_pass_filter, 1, Q_base)
+        ##### Downconversion #####
+        baseband_signal = self.__mix(signal)
+
+        ##### Lowpassing & Matched Filtering #####
+        taps, rrc_length = self.__composite_filter()
 
-        ##### Matched Filtering #####
+        ##### Decimation #####
+        # The low-pass tail is cut as lfilter did, the output spans the signal plus the matched filter length
+        output_length = baseband_signal.shape[-1] + rrc_length - 1
+        RC_signal = DecimatingFilter(baseband_signal, taps, self.decimation, self.decimation_phase, output_length, method=self.filter_method)
+
+        return RC_signal
+
+    def __composite_filter(self):
+        """
+            Returns the low-pass and matched RRC filters merged into one FIR, with the gain folded in,
+            and the matched filter length.
+        """
+        rrc, gain = self.__matched_filter()
+        if self.baseband:
+            return rrc * gain, len(rrc)
+        return np.convolve(self.low_pass_filter, rrc) * gain, len(rrc)
+
+    def __decision_delay(self):
+        """
+            Full rate sample index of the first symbol decision (matched filters and low-pass group delay).
+        """
+        RRC_delay = 3*self.symbol_period
+        return int((2*RRC_delay + self.low_pass_delay) * self.sampling_rate)
+
+    def __decimation(self):
+        """
+            Largest divisor of samples_per_symbol that keeps at least `output_samples_per_symbol` samples per symbol.
+        """
+        if not self.output_samples_per_symbol:
+            return 1
+        return max((d for d in range(1, self.samples_per_symbol + 1)
+                   if self.samples_per_symbol % d == 0 and self.samples_per_symbol // d >= self.output_samples_per_symbol), default=1)
+
+    def __matched_filter(self):
+        """
+            Returns the matched RRC filter taps and the gain applied after matched filtering
+            (input gain, energy normalisation, 2x from the trig identity in passband mode and constellation scaling).
+            Also sets the output grid, `demodulator_total_delay` and `symbol_step` in output samples.
+        """
         RRC_delay = 3*self.symbol_period
         _, rrc = RRCFilter(
             N=int(2*self.sampling_rate*RRC_delay),
@@ -105,21 +238,98 @@ class Demodulator:
             Fs=self.sampling_rate
         )
 
-        baseband_signal_lp = I_lp + 1j*Q_lp
-        RC_signal = sig.fftconvolve(baseband_signal_lp, rrc) / np.sum(rrc**2) * 2 #Energy Normalization and 2x from trig identity
-
-        
-        ##### Scaling #####
         if self.order <= 2:
             scaler = 1
         else:
             scaler = (2/3*(2**(self.order)-1))**0.5
-        
-        RC_signal *= scaler
 
-        self.demodulator_total_delay = int((2*RRC_delay + self.low_pass_delay) * self.sampling_rate)
+        decision_delay = self.__decision_delay()
+        self.decimation = self.__decimation()
+        self.decimation_phase = decision_delay % self.decimation
+        self.demodulator_total_delay = decision_delay // self.decimation
+        self.symbol_step = self.samples_per_symbol // self.decimation
 
-        return RC_signal
+        mixer_gain = 1 if self.baseband else 2
+
+        return rrc, self.input_gain * mixer_gain / np.sum(rrc**2) * scaler
+
+    def demodulate_stream(self, blocks):
+        """
+            Demodulates a received signal block by block.
+
+            The NCO phase (absolute sample index) and the last len(taps)-1 inputs of the composite low-pass
+            and matched filter (overlap-save) are carried between blocks, so memory stays constant and the
+            decisions equal `demapping(demodulate(signal))` of the whole signal.
+
+            Parameters:
+                blocks (iterable of np.array): Consecutive 1-D blocks of the received signal, any sizes.
+
+            Yields:
+                tuple: 
+                    - symbols (np.array): Complex symbol samples decided in this block.
+                    - bits (np.array): uint8 bits of those symbols.
+        """
+        taps, rrc_length = self.__composite_filter()
+        overlap = len(taps) - 1
+
+        # Decisions end 6 symbols before the end of the matched filter output, hold back samples that might be past it
+        holdback = max(0, 6*self.samples_per_symbol - (rrc_length - 1))
+
+        history = np.zeros(overlap, dtype=complex)
+        sample_index = 0
+
+        pending = np.zeros(0, dtype=complex)  # Filter output not yet decided
+        pending_start = 0                     # Absolute index of pending[0]
+        next_decision = self.__decision_delay()
+
+        def decide(end):
+            nonlocal pending, pending_start, next_decision
+            positions = np.arange(next_decision, end, self.samples_per_symbol)
+            symbols = pending[positions - pending_start]
+            if len(positions):
+                next_decision = positions[-1] + self.samples_per_symbol
+            consumed = min(next_decision - pending_start, len(pending))
+            pending = pending[consumed:]
+            pending_start += consumed
+            return symbols, self.symbols2bits(symbols.real, symbols.imag)
+
+        def composite_filter(baseband_signal):
+            nonlocal history
+            extended = np.concatenate([history, baseband_signal])
+            history = extended[len(extended) - overlap:]
+            return sig.fftconvolve(extended, taps, mode='valid')
+
+        for block in blocks:
+            block = np.asarray(block)
+            if len(block) == 0:
+                continue
+            baseband_signal = self.__mix(block, sample_index)
+            sample_index += len(block)
+
+            pending = np.concatenate([pending, composite_filter(baseband_signal)])
+            yield decide(sample_index - holdback)
+
+        # Flush the matched filter tail, its output is len(rrc)-1 samples longer than the signal
+        pending = np.concatenate([pending, composite_filter(np.zeros(rrc_length - 1, dtype=complex))])
+        yield decide(sample_index + rrc_length - 1 - 6*self.samples_per_symbol)
+    
+    def demodulate_batch(self, signals):
+        """
+            Demodulates a block of received signals to their baseband envelopes.
+
+            Every row is processed as by `demodulate`, but the mixer, low-pass filter and matched filter
+            are each applied once across the whole block.
+
+            Parameters:
+                signals (np.array): 2-D array of received waveforms, one per row (e.g. one row per SNR or per trial).
+
+            Returns:
+                np.array: 2-D array of baseband envelopes, one per row.
+        """
+        signals = np.asarray(signals)
+        if signals.ndim != 2:
+            raise ValueError(f"demodulate_batch expects a 2-D array of signals, got {signals.ndim}-D")
+        return self.demodulate(signals)
         
     
     def demapping(self, demod_signal):
@@ -135,13 +345,9 @@ class Demodulator:
                     an error message is returned.
                     - bit_array (np.array): The bit array extracted from the demodulated signal.
         """
-        bit_array = self.decision_demapper(demod_signal[:-(6*self.samples_per_symbol)])
+        bit_array = self.decision_demapper(demod_signal[:-(6*self.symbol_step)])
 
-        byte_chunks = [bit_array[i:i+8] for i in range(0, len(bit_array), 8)]
-
-        byte_values = [int(''.join(map(str, chunk)), 2) for chunk in byte_chunks]
-
-        byte_array = bytes(byte_values)
+        byte_array = self.bits2bytes(bit_array)
 
         try:
             text = byte_array.decode('utf-8')
@@ -150,20 +356,55 @@ class Demodulator:
 
         return text, bit_array
 
+    @staticmethod
+    def bits2bytes(bit_array):
+        """
+            Packs a bit array into bytes, MSB first.
+
+            A trailing partial byte is kept as the integer value of its remaining bits.
+
+            Parameters:
+                bit_array (np.array): 1-D array of 0/1 bits.
+
+            Returns:
+                bytes: The packed bytes.
+        """
+        whole = len(bit_array) - len(bit_array) % 8
+        byte_array = np.packbits(bit_array[:whole].astype(np.uint8, copy=False)).tobytes()
+
+        if whole != len(bit_array):
+            remainder = bit_array[whole:].astype(int)
+            byte_array += bytes([int(remainder @ (1 << np.arange(len(remainder) - 1, -1, -1)))])
+
+        return byte_array
+
     def decision_demapper(self, demodulated_signal: np.ndarray) -> np.ndarray:
         """Maps the in-phase (I) and quadrature (Q) components of a signal to a bit array.
 
         Parameters:
             demodulated_signal (np.ndarray): The input demodulated signal containing I and Q components.
+                A 2-D block of signals (one per row) returns one bit row per signal.
 
         Returns:
-            np.ndarray: Bit array representing the demodulated signal.
+            np.ndarray: uint8 bit array representing the demodulated signal.
         """
 
-        i_samples = demodulated_signal[self.demodulator_total_delay::self.samples_per_symbol].real
-        q_samples = demodulated_signal[self.demodulator_total_delay::self.samples_per_symbol].imag
+        i_samples = demodulated_signal[..., self.demodulator_total_delay::self.symbol_step].real
+        q_samples = demodulated_signal[..., self.demodulator_total_delay::self.symbol_step].imag
+
+        return self.symbols2bits(i_samples, q_samples)
+
+    def symbols2bits(self, i_samples, q_samples):
+        """Maps sampled I and Q components to bits, along the last axis.
+
+        Parameters:
+            i_samples (np.ndarray): In-phase symbol samples.
+            q_samples (np.ndarray): Quadrature symbol samples.
 
-        bit_array = np.zeros(len(i_samples) * self.order, dtype=int)
+        Returns:
+            np.ndarray: uint8 bit array, `order` bits per symbol.
+        """
+        bit_array = np.zeros(i_samples.shape[:-1] + (i_samples.shape[-1] * self.order,), dtype=np.uint8)
 
         if self.order == 1:
             bit_array[:] = np.where(i_samples > 0, 1, 0)
@@ -171,154 +412,19 @@ class Demodulator:
             i_bits = np.where(i_samples > 0, 1, 0)
             q_bits = np.where(q_samples > 0, 1, 0)
 
-            bit_array[0::2] = i_bits
-            bit_array[1::2] = q_bits
+            bit_array[..., 0::2] = i_bits
+            bit_array[..., 1::2] = q_bits
         else:
-            with open(rf'FYP_NextGenIoT_Simulator/QAM_LUT_pkl/R{self.modulation_mode}.pkl', 'rb') as file:
-                qam_const = pickle.load(file)
+            qam_constellation = get_constellation(self.modulation_mode)
 
-            qam_tree = spysp.KDTree([k for k in qam_const.keys()])
-            coord = qam_tree.query(list(zip(i_samples, q_samples)))[1]
+            if self.demapper == 'slicer':
+                labels = qam_constellation.slice(i_samples, q_samples)
+            elif self.demapper == 'kdtree':
+                labels = qam_constellation.tree.query(np.stack([i_samples, q_samples], axis=-1))[1]
+            else:
+                raise ValueError(f"Invalid demapper: {self.demapper}")
 
-            bit_array[:] = np.array([list(qam_const[tuple(qam_tree.data[i])]) for i in coord]).flatten()
+            # Labels index the bit table directly
+            bit_array[:] = qam_constellation.bits[labels].reshape(bit_array.shape)
 
         return bit_array
-    
-    #### Plotting Functions ####    
-    def plot_setup(self, fig):
-        """
-        Configures and returns a dictionary of plot axes based on the plotting flags set in the object.
-
-        Parameters:
-            fig (matplotlib.figure.Figure): The figure object to which the plots will be added.
-
-        Returns:
-            Dict: An dictionary containing the axes for the plots. Keys are 'Iplot', 'Qplot', and 'ConstPlot' 
-                depending on the plotting configuration. Returns None if no plots are to be generated.
-
-        The function sets up subplots in the provided figure based on the modulation mode and plotting flags:
-        - If both Eye Diagram and Constellation plots are enabled:
-            - For non-BPSK modulation modes, creates a grid with 3 rows and 2 columns for I, Q, and Constellation plots.
-            - For BPSK modulation, creates a grid with a single row for I and Constellation plots.
-        - If only Eye Diagram plots are enabled:
-            - For non-BPSK modulation modes, creates a grid with 1 row and 2 columns for I and Q plots.
-            - For BPSK modulation, creates a grid with a single row for the I plot.
-        - If both IQ and Constellation plots are enabled, creates a similar configuration as Eye Diagram and Constellation.
-        - If only IQ plots are enabled, creates a grid for I and Q plots.
-        - If only Constellation plots are enabled, creates a grid for the Constellation plot.
-        - Closes all figures and returns None if no plots are enabled.
-        """
-        axes = {}
-        if self.plot_EyeDiagram and self.plot_constellation: #If EyeDiagram and Constellation are both True
-            if self.modulation_mode != 'BPSK':
-                gridspec = fig.add_gridspec(nrows=3, ncols=2)
-                axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
-                axes['Qplot'] = fig.add_subplot(gridspec[0, 1])
-                axes['ConstPlot'] = fig.add_subplot(gridspec[1:, :])
-            else:
-                gridspec = fig.add_gridspec(nrows=2, ncols=1)
-                axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
-                axes['ConstPlot'] = fig.add_subplot(gridspec[1:, :])
-        elif self.plot_EyeDiagram: #If EyeDiagram is True
-            if self.modulation_mode != 'BPSK':
-                gridspec = fig.add_gridspec(nrows=1, ncols=2)
-                axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
-                axes['Qplot'] = fig.add_subplot(gridspec[0, 1])
-            else:
-                gridspec = fig.add_gridspec(nrows=1, ncols=1)
-                axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
-        elif self.plot_IQ and self.plot_constellation:
-            gridspec = fig.add_gridspec(nrows=3, ncols=2)
-            axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
-            axes['Qplot'] = fig.add_subplot(gridspec[0, 1])
-            axes['ConstPlot'] = fig.add_subplot(gridspec[1:, :])
-        elif self.plot_IQ:
-            gridspec = fig.add_gridspec(nrows=1, ncols=2)
-            axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
-            axes['Qplot'] = fig.add_subplot(gridspec[0, 1])
-        elif self.plot_constellation:
-            gridspec = fig.add_gridspec(nrows=1, ncols=1)
-            axes['ConstPlot'] = fig.add_subplot(gridspec[0, 0])
-        else:
-            plt.close('all')
-            return None
-        return axes
-
-    def received_IQ(self, demod_signal):
-        delay = self.demodulator_total_delay
-        t_axis = np.linspace(0, len(demod_signal)/self.sampling_rate, len(demod_signal), endpoint=False)
-        t_samples = t_axis[delay:-(6*self.samples_per_symbol):self.samples_per_symbol]
-        demod_signal_samples = demod_signal[delay:-(6*self.samples_per_symbol):self.samples_per_symbol]
-
-        self.ax['Iplot'].plot(t_axis/self.symbol_period, demod_signal.real)
-        self.ax['Iplot'].stem(t_samples/self.symbol_period, demod_signal_samples.real, linefmt='r', markerfmt='ro')
-        self.ax['Iplot'].set_title("I-Component")
-        self.ax['Iplot'].set_xlabel("Symbol Periods (s)")
-        self.ax['Iplot'].set_ylabel("Amplitude")
-        self.ax['Iplot'].grid(True)
-
-        self.ax['Qplot'].plot(t_axis/self.symbol_period, demod_signal.imag)
-        self.ax['Qplot'].stem(t_samples/self.symbol_period, demod_signal_samples.imag, linefmt='r', markerfmt='ro')
-        self.ax['Qplot'].set_title("Q-Component")
-        self.ax['Qplot'].set_xlabel("Symbol Periods (s)")
-        self.ax['Qplot'].set_ylabel("Amplitude")
-        self.ax['Qplot'].grid(True)
-    
-    def received_constellation(self, demod_signal):
-        demod_signal = demod_signal[:-(6*self.samples_per_symbol)]
-        demod_signal_samples = demod_signal[self.demodulator_total_delay::self.samples_per_symbol]
-        self.ax['ConstPlot'].scatter(demod_signal_samples.real, demod_signal_samples.imag,xunits='V', yunits='V')
-        self.ax['ConstPlot'].set_title("Received Constellation")
-        self.ax['ConstPlot'].set_xlabel("I")
-        self.ax['ConstPlot'].set_ylabel("Q")
-        self.ax['ConstPlot'].grid(True)
-        scaler = ((2**(self.order/2))-1) if self.order > 2 else 1
-        x_ticks = np.arange(-scaler, scaler+1, 2)
-        y_ticks = np.arange(-scaler, scaler+1, 2)
-        self.ax['ConstPlot'].set_xticks(x_ticks)
-        self.ax['ConstPlot'].set_yticks(y_ticks)
-    
-    def eye_diagram(self, demod_signal):
-        demod_signal_samples = demod_signal[self.demodulator_total_delay:-6*self.samples_per_symbol:self.samples_per_symbol]
-        i_samples = []
-        q_samples = []
-        BitLen = len(demod_signal_samples)
-        for i in range(BitLen - 2):
-            i_samples.append(demod_signal[self.demodulator_total_delay + self.samples_per_symbol * i + np.arange(2 * self.samples_per_symbol)].real)
-            if self.modulation_mode != 'BPSK':
-                q_samples.append(demod_signal[self.demodulator_total_delay + self.samples_per_symbol * i + np.arange(2 * self.samples_per_symbol)].imag)
-
-        i_samples = np.array(i_samples).T
-        q_samples = np.array(q_samples).T if self.modulation_mode != 'BPSK' else None
-        time_axis = np.linspace(-self.symbol_period, self.symbol_period, 2 * self.samples_per_symbol)
-        if self.modulation_mode != 'BPSK':
-            self.ax['Iplot'].plot(time_axis, i_samples, color='r',xunits='s', yunits='V')
-            self.ax['Qplot'].plot(time_axis, q_samples, color='b',xunits='s', yunits='V')
-            self.ax['Iplot'].set_title("I-Component")
-            self.ax['Qplot'].set_title("Q-Component")
-            self.ax['Iplot'].set_xlabel("Time (s)")
-            self.ax['Qplot'].set_xlabel("Time (s)")
-            self.ax['Iplot'].set_ylabel("Amplitude")
-            self.ax['Qplot'].set_ylabel("Amplitude")
-        else:
-            self.ax['Iplot'].plot(time_axis, i_samples, color='r',xunits='s', yunits='V')
-            self.ax['Iplot'].set_title("I-Component")
-            self.ax['Iplot'].set_xlabel("Time (s)")
-            self.ax['Iplot'].set_ylabel("Amplitude")
-        
-    def auto_plot(self, demod_signal):
-        """
-        Automatically plots the IQ components and/or the received constellation.
-
-        Args:
-            demod_signal (np.array): The demodulated signal.
-            
-        ### To extract figure, use self.fig 
-        """
-        if self.plot_IQ and not self.plot_EyeDiagram:
-            self.received_IQ(demod_signal)
-        if self.plot_constellation:
-            self.received_constellation(demod_signal)
-        if self.plot_EyeDiagram:
-            self.eye_diagram(demod_signal)
-        
\ No newline at end of file
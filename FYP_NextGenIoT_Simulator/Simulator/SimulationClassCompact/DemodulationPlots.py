@@ -0,0 +1,230 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# matplotlib is only imported once a figure is drawn, so headless sweeps and worker processes never load it
+def _pyplot():
+    import matplotlib.pyplot as plt
+    return plt
+
+def _log_norm(vmax):
+    from matplotlib.colors import LogNorm
+    return LogNorm(vmin=1, vmax=max(vmax, 1))
+
+
+class DemodulatorPlots:
+    """
+    Plotting functions of the Demodulator, kept apart from the DSP core.
+
+    Expects the Demodulator attributes (modulation_mode, order, symbol_period, sampling_rate, decimation,
+    symbol_step, demodulator_total_delay, the plot flags and `_fig`).
+    """
+    @property
+    def fig(self):
+        """
+        The 'Demodulator' figure, created on first access.
+        """
+        if self._fig is None:
+            self._fig = _pyplot().figure('Demodulator', constrained_layout=True)
+        return self._fig
+
+    @fig.setter
+    def fig(self, fig):
+        self._fig = fig
+
+    def plot_setup(self, fig):
+        """
+        Configures and returns a dictionary of plot axes based on the plotting flags set in the object.
+
+        Parameters:
+            fig (matplotlib.figure.Figure): The figure object to which the plots will be added.
+
+        Returns:
+            Dict: An dictionary containing the axes for the plots. Keys are 'Iplot', 'Qplot', and 'ConstPlot' 
+                depending on the plotting configuration. Returns None if no plots are to be generated.
+
+        The function sets up subplots in the provided figure based on the modulation mode and plotting flags:
+        - If both Eye Diagram and Constellation plots are enabled:
+            - For non-BPSK modulation modes, creates a grid with 3 rows and 2 columns for I, Q, and Constellation plots.
+            - For BPSK modulation, creates a grid with a single row for I and Constellation plots.
+        - If only Eye Diagram plots are enabled:
+            - For non-BPSK modulation modes, creates a grid with 1 row and 2 columns for I and Q plots.
+            - For BPSK modulation, creates a grid with a single row for the I plot.
+        - If both IQ and Constellation plots are enabled, creates a similar configuration as Eye Diagram and Constellation.
+        - If only IQ plots are enabled, creates a grid for I and Q plots.
+        - If only Constellation plots are enabled, creates a grid for the Constellation plot.
+        - Closes all figures and returns None if no plots are enabled.
+        """
+        axes = {}
+        if self.plot_EyeDiagram and self.plot_constellation: #If EyeDiagram and Constellation are both True
+            if self.modulation_mode != 'BPSK':
+                gridspec = fig.add_gridspec(nrows=3, ncols=2)
+                axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
+                axes['Qplot'] = fig.add_subplot(gridspec[0, 1])
+                axes['ConstPlot'] = fig.add_subplot(gridspec[1:, :])
+            else:
+                gridspec = fig.add_gridspec(nrows=2, ncols=1)
+                axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
+                axes['ConstPlot'] = fig.add_subplot(gridspec[1:, :])
+        elif self.plot_EyeDiagram: #If EyeDiagram is True
+            if self.modulation_mode != 'BPSK':
+                gridspec = fig.add_gridspec(nrows=1, ncols=2)
+                axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
+                axes['Qplot'] = fig.add_subplot(gridspec[0, 1])
+            else:
+                gridspec = fig.add_gridspec(nrows=1, ncols=1)
+                axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
+        elif self.plot_IQ and self.plot_constellation:
+            gridspec = fig.add_gridspec(nrows=3, ncols=2)
+            axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
+            axes['Qplot'] = fig.add_subplot(gridspec[0, 1])
+            axes['ConstPlot'] = fig.add_subplot(gridspec[1:, :])
+        elif self.plot_IQ:
+            gridspec = fig.add_gridspec(nrows=1, ncols=2)
+            axes['Iplot'] = fig.add_subplot(gridspec[0, 0])
+            axes['Qplot'] = fig.add_subplot(gridspec[0, 1])
+        elif self.plot_constellation:
+            gridspec = fig.add_gridspec(nrows=1, ncols=1)
+            axes['ConstPlot'] = fig.add_subplot(gridspec[0, 0])
+        else:
+            _pyplot().close('all')
+            return None
+        return axes
+
+    def received_IQ(self, demod_signal):
+        delay = self.demodulator_total_delay
+        output_sampling_rate = self.sampling_rate/self.decimation
+        t_axis = np.linspace(0, len(demod_signal)/output_sampling_rate, len(demod_signal), endpoint=False)
+        t_samples = t_axis[delay:-(6*self.symbol_step):self.symbol_step]
+        demod_signal_samples = demod_signal[delay:-(6*self.symbol_step):self.symbol_step]
+
+        self.ax['Iplot'].plot(t_axis/self.symbol_period, demod_signal.real)
+        self.ax['Iplot'].stem(t_samples/self.symbol_period, demod_signal_samples.real, linefmt='r', markerfmt='ro')
+        self.ax['Iplot'].set_title("I-Component")
+        self.ax['Iplot'].set_xlabel("Symbol Periods (s)")
+        self.ax['Iplot'].set_ylabel("Amplitude")
+        self.ax['Iplot'].grid(True)
+
+        self.ax['Qplot'].plot(t_axis/self.symbol_period, demod_signal.imag)
+        self.ax['Qplot'].stem(t_samples/self.symbol_period, demod_signal_samples.imag, linefmt='r', markerfmt='ro')
+        self.ax['Qplot'].set_title("Q-Component")
+        self.ax['Qplot'].set_xlabel("Symbol Periods (s)")
+        self.ax['Qplot'].set_ylabel("Amplitude")
+        self.ax['Qplot'].grid(True)
+    
+    def received_constellation(self, demod_signal):
+        demod_signal = demod_signal[:-(6*self.symbol_step)]
+        demod_signal_samples = demod_signal[self.demodulator_total_delay::self.symbol_step]
+        if len(demod_signal_samples) <= self.constellation_max_points:
+            self.ax['ConstPlot'].scatter(demod_signal_samples.real, demod_signal_samples.imag,xunits='V', yunits='V')
+        else:
+            self.constellation_density(self.ax['ConstPlot'], demod_signal_samples, self.constellation_bins)
+        self.ax['ConstPlot'].set_title("Received Constellation")
+        self.ax['ConstPlot'].set_xlabel("I")
+        self.ax['ConstPlot'].set_ylabel("Q")
+        self.ax['ConstPlot'].grid(True)
+        scaler = ((2**(self.order/2))-1) if self.order > 2 else 1
+        x_ticks = np.arange(-scaler, scaler+1, 2)
+        y_ticks = np.arange(-scaler, scaler+1, 2)
+        self.ax['ConstPlot'].set_xticks(x_ticks)
+        self.ax['ConstPlot'].set_yticks(y_ticks)
+    
+    @staticmethod
+    def constellation_density(ax, symbols, bins=400):
+        """
+        Draws received symbols as a 2-D histogram image with a log colour scale, so render time and
+        memory are bounded by the bin count instead of the number of symbols.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axis to draw on.
+            symbols (np.array): Complex symbol samples.
+            bins (int): Number of bins per axis.
+        """
+        if len(symbols) == 0:
+            return
+        limit = max(np.abs(symbols.real).max(), np.abs(symbols.imag).max(), 1)
+        counts, _, _ = np.histogram2d(symbols.real, symbols.imag, bins=bins, range=[[-limit, limit], [-limit, limit]])
+        ax.imshow(np.ma.masked_equal(counts.T, 0), origin='lower', aspect='auto', interpolation='nearest', cmap='viridis',
+                  norm=_log_norm(counts.max()), extent=(-limit, limit, -limit, limit))
+
+    def eye_traces(self, demod_signal):
+        """
+        Cuts the demodulated signal into two symbol periods long eye diagram traces, one per decided symbol.
+
+        Args:
+            demod_signal (np.array): The demodulated signal.
+
+        Returns:
+            tuple: 
+                - time_axis (np.array): Time axis of a trace, 2*symbol_step samples over [-Ts, Ts].
+                - traces (np.array): (traces x 2*symbol_step) complex sliding window view of demod_signal, no copy is made.
+        """
+        delay = self.demodulator_total_delay
+        num_traces = max(len(demod_signal[delay:-6*self.symbol_step:self.symbol_step]) - 2, 0)
+        windows = sliding_window_view(demod_signal[delay:], 2 * self.symbol_step)[::self.symbol_step]
+        time_axis = np.linspace(-self.symbol_period, self.symbol_period, 2 * self.symbol_step)
+        return time_axis, windows[:num_traces]
+
+    def eye_diagram(self, demod_signal):
+        time_axis, traces = self.eye_traces(demod_signal)
+        density = self.eye_mode == 'density' or (self.eye_mode == 'auto' and len(traces) > self.eye_max_traces)
+
+        components = [('Iplot', traces.real, 'r', "I-Component")]
+        if self.modulation_mode != 'BPSK':
+            components.append(('Qplot', traces.imag, 'b', "Q-Component"))
+
+        for key, component, color, title in components:
+            if density:
+                self.eye_density(self.ax[key], time_axis, component)
+            else:
+                # All traces as one line, NaN columns break it between traces
+                separated = np.concatenate([component, np.full((len(component), 1), np.nan)], axis=1)
+                self.ax[key].plot(np.tile(np.append(time_axis, np.nan), len(component)), separated.ravel(), color=color, xunits='s', yunits='V')
+            self.ax[key].set_title(title)
+            self.ax[key].set_xlabel("Time (s)")
+            self.ax[key].set_ylabel("Amplitude")
+
+    @staticmethod
+    def eye_density(ax, time_axis, component, bins=200, max_columns=256):
+        """
+        Draws eye diagram traces as a 2-D histogram of amplitude against time, with a log colour scale.
+        A single image replaces one line per trace, so the cost does not grow with the number of artists.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axis to draw on.
+            time_axis (np.array): Time axis of a trace.
+            component (np.array): (traces x samples) real traces.
+            bins (int): Number of amplitude bins.
+            max_columns (int): Traces longer than this are subsampled in time to at most this many columns.
+        """
+        if component.size == 0:
+            return
+        stride = -(-component.shape[1] // max_columns)
+        component = component[:, ::stride]
+        time_axis = time_axis[::stride]
+        columns = component.shape[1]
+
+        low, high = component.min(), component.max()
+        if high <= low:
+            high = low + 1
+        rows = np.clip(((component - low) / (high - low) * bins).astype(np.intp), 0, bins - 1)
+        counts = np.bincount((rows * columns + np.arange(columns)).ravel(), minlength=bins * columns).reshape(bins, columns)
+
+        ax.imshow(np.ma.masked_equal(counts, 0), origin='lower', aspect='auto', interpolation='nearest', cmap='inferno',
+                  norm=_log_norm(counts.max()), extent=(time_axis[0], time_axis[-1], low, high))
+        
+    def auto_plot(self, demod_signal):
+        """
+        Automatically plots the IQ components and/or the received constellation.
+
+        Args:
+            demod_signal (np.array): The demodulated signal.
+            
+        ### To extract figure, use self.fig 
+        """
+        if self.plot_IQ and not self.plot_EyeDiagram:
+            self.received_IQ(demod_signal)
+        if self.plot_constellation:
+            self.received_constellation(demod_signal)
+        if self.plot_EyeDiagram:
+            self.eye_diagram(demod_signal)
+        
\ No newline at end of file
@@ -1,14 +1,15 @@
 from scipy.io import wavfile as wav
 import numpy as np
 import scipy.signal as sig
-import pickle
 from .RRCFilter import RRCFilter
-
-from matplotlib import pyplot as plt
+from .PulseShaping import PulseShaper
+from .ConstellationRegistry import get_constellation
+from .WavMetadata import write_metadata
+from .NCO import CarrierPhasor
 
 class Modulator:
     modulation_modes = {'BPSK': 1, 'QPSK': 2, 'QAM16': 4, 'QAM64': 6, 'QAM256': 8, 'QAM1024': 10, 'QAM4096': 12}
-    def __init__(self, modulation_mode, bit_rate,carrier_freq) -> None:
+    def __init__(self, modulation_mode, bit_rate,carrier_freq, baseband=False, samples_per_symbol=8, sampling_rate=None, oversampling_factor=10) -> None:
         '''
             Initialize the Modulator class
 
@@ -16,6 +17,12 @@ class Modulator:
                 modulation_mode (str): Modulation mode to be used. Can be 'BPSK', 'QPSK', 'QAM16', 'QAM64', 'QAM256', 'QAM1024', 'QAM4096'.
                 bit_rate (int): Bit rate of the signal.
                 carrier_freq (int): Carrier frequency of the signal.
+                baseband (bool): Complex baseband mode. The complex envelope is returned at `samples_per_symbol`
+                    samples per symbol instead of being upconverted to the carrier. Defaults to False.
+                samples_per_symbol (int): Samples per symbol in baseband mode. Defaults to 8.
+                sampling_rate (float or str): Passband sampling rate, independent of the carrier. 'minimum' selects
+                    `minimum_sampling_rate`. Defaults to None, i.e. oversampling_factor*2*carrier_freq.
+                oversampling_factor (int): Oversampling of the carrier when no sampling rate is given. Defaults to 10.
         '''
         #Modulation Parameters
         self.carrier_freq = carrier_freq
@@ -23,29 +30,111 @@ class Modulator:
         self.order = self.modulation_modes[modulation_mode]
 
         #Bit Rate Parameters
+        self.bit_rate = bit_rate
         self.baud_rate = bit_rate/self.order
         self.symbol_period = 1/self.baud_rate
 
+        #RRC Filter Parameters
+        self.RRC_alpha = 0.35
+
         #Sampler Parameters 
-        self.oversampling_factor = 10
-        self.sampling_rate = self.oversampling_factor*2*self.carrier_freq # 10x Oversampling Factor for any CF 
+        self.oversampling_factor = oversampling_factor
+        if sampling_rate is None:
+            self.sampling_rate = self.oversampling_factor*2*self.carrier_freq # 10x Oversampling Factor for any CF by default
+        elif sampling_rate == 'minimum':
+            self.sampling_rate = self.minimum_sampling_rate(carrier_freq, bit_rate, self.order, self.RRC_alpha)
+        else:
+            nyquist_rate = 2*(carrier_freq + (1 + self.RRC_alpha)*self.baud_rate/2)
+            if sampling_rate < nyquist_rate:
+                raise ValueError(f"Sampling rate {sampling_rate} Hz is below the Nyquist rate {nyquist_rate} Hz of the carrier plus signal bandwidth.")
+            self.sampling_rate = sampling_rate
+
+        #Baseband Parameters
+        self.baseband = baseband
+        self.passband_sampling_rate = self.sampling_rate
+        if baseband:
+            self.sampling_rate = samples_per_symbol*self.baud_rate
+
+        # SNR is defined over the full bandwidth of the 10x oversampled carrier, other rates offset the channel SNR
+        # so the noise density is unchanged. After the 2x demodulator gain the baseband noise is another 2x lower.
+        reference_sampling_rate = 10*2*self.carrier_freq
+        self.snr_offset = 10*np.log10(reference_sampling_rate/((2 if baseband else 1)*self.sampling_rate))
 
         #IQ Return and Save Parameters
         self.IQ_Return = False
         self.save_signal = False
-        
-        #RRC Filter Parameters
-        self.RRC_alpha = 0.35
+
+        #Pulse Shaping Engine ('auto', 'polyphase' or 'fft')
+        self.shaping_method = 'auto'
+
+    @staticmethod
+    def minimum_sampling_rate(carrier_freq, bit_rate, order, RRC_alpha=0.35):
+        '''
+            Lowest sampling rate that satisfies Nyquist for the carrier plus the RRC signal bandwidth
+
+            The rate is rounded up to a whole multiple of the bit rate, so every symbol spans a whole number of
+            samples (and the rate is an integer for WAV files), skipping multiples where float rounding would
+            truncate the samples per symbol.
+
+            Parameters:
+                carrier_freq (float): Carrier frequency of the signal.
+                bit_rate (int): Bit rate of the signal.
+                order (int): Bits per symbol.
+                RRC_alpha (float): Roll off factor of the RRC filter.
+
+            Returns:
+                float: The sampling rate in Hz.
+        '''
+        baud_rate = bit_rate/order
+        nyquist_rate = 2*(carrier_freq + (1 + RRC_alpha)*baud_rate/2)
+        multiple = int(np.floor(nyquist_rate/bit_rate)) + 1
+        while True:
+            sampling_rate = multiple*bit_rate
+            samples_per_symbol = multiple*order
+            if int(sampling_rate/baud_rate) == int(sampling_rate*(1/baud_rate)) == samples_per_symbol \
+                    and int(2*sampling_rate*3*(1/baud_rate)) == 6*samples_per_symbol:
+                return sampling_rate
+            multiple += 1
+
+    @staticmethod
+    def msg2bits_static(msg):
+        '''
+            Convert characters to a bit array
+
+            Parameters:
+                msg (str): Message to be converted to bits
+
+            Returns:
+                np.array: uint8 array of the UTF-8 encoded message bits, MSB first.
+        '''
+        return np.unpackbits(np.frombuffer(msg.encode('utf-8'), dtype=np.uint8))
+
+    def msg2bits(self, msg):
+        '''
+            Convert characters to a bit array, padded to a whole number of symbols plus two trailing zeros
+
+            Parameters:
+                msg (str): Message to be converted to bits
+
+            Returns:
+                np.array: uint8 bit array ready for `modulate`.
+        '''
+        bits = self.msg2bits_static(msg)
+        padding = (-len(bits)) % self.order
+        return np.concatenate([bits, np.zeros(padding + 2, dtype=np.uint8)])
 
     @staticmethod
     def msgchar2bit_static(msg):
         '''
-            Convert bits to characters
+            Convert characters to bits
 
             Parameters:
-                msg (str): Bit string to be converted to characters
+                msg (str): Message to be converted to bits
+
+            Returns:
+                list: List of '0'/'1' characters. Thin wrapper of `msg2bits_static`.
         '''
-        return list(''.join(f'{byte:08b}' for byte in msg.encode('utf-8')))
+        return Modulator.msg2bits_static(msg).astype(str).tolist()
     
     def msgchar2bit(self, msg):
         '''
@@ -53,26 +142,49 @@ class Modulator:
 
             Parameters:
                 msg (str): Message to be converted to bits
+
+            Returns:
+                list: List of '0'/'1' characters. Thin wrapper of `msg2bits`.
+        '''
+        return self.msg2bits(msg).astype(str).tolist()
+
+    @staticmethod
+    def as_bits(bitstr):
         '''
-        bitstr = list(''.join(f'{byte:08b}' for byte in msg.encode('utf-8')))
+            Convert a bit string in either format to a uint8 bit array
 
-        if len(bitstr) % self.order != 0:
-            bitstr.extend(['0']*(self.order - len(bitstr) % self.order))
+            Parameters:
+                bitstr (list or np.array): List of '0'/'1' characters or array of 0/1 integers
+        '''
+        bits = np.asarray(bitstr)
+        if bits.dtype.kind in 'US':
+            return (bits == '1').astype(np.uint8)
+        return bits.astype(np.uint8, copy=False)
 
-        bitstr.extend(['0', '0'])
+    def bits2symbols(self, bits):
+        '''
+            Group bits into integer symbol indices (bit labels), MSB first
 
-        return bitstr
+            Parameters:
+                bits (np.array): uint8 bit array without the two trailing padding bits, a whole number of symbols long
+        '''
+        groups = bits.reshape(-1, self.order)
+        symbols = np.zeros(len(groups), dtype=np.intp)
+        for column in groups.T:
+            symbols <<= 1
+            symbols |= column
+        return symbols
 
     def digitalsignal(self, bitstr):
         '''
             Convert bits to digital signal
 
             Parameters:
-                bitstr (str): Bit string to be converted to digital signal            
+                bitstr (list or np.array): Bit string or bit array to be converted to digital signal            
         '''
-        signal_duration = len(bitstr)*self.symbol_period
-        x_axis_digital = np.linspace(0, signal_duration, len(bitstr), endpoint=False)
-        digital_signal = np.array([int(bit) for bit in bitstr])
+        digital_signal = self.as_bits(bitstr)
+        signal_duration = len(digital_signal)*self.symbol_period
+        x_axis_digital = np.linspace(0, signal_duration, len(digital_signal), endpoint=False)
         return digital_signal, x_axis_digital
 
     def modulate(self, bitstr):
@@ -80,7 +192,8 @@ class Modulator:
             Modulate the digital signal
 
             Parameters:
-                bitstr (str): Bit string to be modulated
+                bitstr (list or np.array): Bit string ('0'/'1' characters) or uint8 bit array to be modulated,
+                    as returned by `msgchar2bit` or `msg2bits`
 
             Returns:
                 tuple: A tuple containing:
@@ -95,66 +208,139 @@ class Modulator:
                 - Dirac_Comb (np.array): Dirac Comb impulse train.
                 - RRC_delay (float): Delay due to the Root Raised Cosine Filter.
         '''
-        if self.modulation_mode == 'BPSK':
-            return self.__bpsk_modulation(bitstr)
-        elif self.modulation_mode == 'QPSK':
-            return self.__qpsk_modulation(bitstr)
-        else:
-            return self.__qam_modulation(bitstr)
-        
-    def __bpsk_modulation(self, bitstr):
-        '''
-            Modulate the digital signal using BPSK
+        symbols = self.bits2symbols(self.as_bits(bitstr)[:-2])
+        I, Q = self.symbols2iq(symbols)
 
-            Parameters:
-                bitstr (str): Bit string to be modulated
-        '''
-        
-        I = np.array([2*int(bit)-1 for bit in bitstr[:-2]])
-        Q = np.zeros_like(I)
-
-        return self.__modulator_calculations(I, Q, bitstr[:-2])
+        return self.__modulator_calculations(I, Q, symbols)
 
-    def __qpsk_modulation(self, bitstr):
+    def symbols2iq(self, symbols):
         '''
-            Modulate the digital signal using QPSK
+            Map integer symbol indices to I and Q components
 
             Parameters:
-                bitstr (str): Bit string to be modulated
-        '''
+                symbols (np.array): Integer symbol indices (bit labels) to be mapped
 
-        bitgroups = [''.join(bitstr[i:i+self.order]) for i in range(0, len(bitstr[:-2]), self.order)]
-        I = np.array([2*int(group[0])-1 for group in bitgroups])
-        Q = np.array([2*int(group[1])-1 for group in bitgroups])
+            Returns:
+                tuple: I (np.array) and Q (np.array) components of the symbols.
+        '''
+        if self.modulation_mode == 'BPSK':
+            I = 2*symbols-1
+            Q = np.zeros_like(I)
+        elif self.modulation_mode == 'QPSK':
+            I = 2*(symbols >> 1)-1
+            Q = 2*(symbols & 1)-1
+        else:
+            points = get_constellation(self.modulation_mode).normalised_points[symbols]
+            I = points.real
+            Q = points.imag
 
-        return self.__modulator_calculations(I, Q, bitgroups)
+        return I, Q
 
-    def __qam_modulation(self, bitstr):
+    def modulate_stream(self, byte_chunks, block_size=2**16):
         '''
-            Modulate the digital signal using QAM - N
+            Modulate a byte stream block by block
 
-            Parameters:
-                bitstr (str): Bit string to be modulated
-        '''
+            The RRC filter tail and the carrier phase (absolute sample index) are carried across chunks, so
+            the concatenated blocks equal `modulate(msg2bits(...))` of the whole stream within float tolerance
+            while memory stays bounded by the block size.
 
-        with open(rf'FYP_NextGenIoT_Simulator\QAM_LUT_pkl\N{self.modulation_mode}.pkl', 'rb') as f:
-            qam_constellations = pickle.load(f)
+            Parameters:
+                byte_chunks (iterable of bytes): Message bytes, in chunks of any size (e.g. file reads).
+                block_size (int): Number of passband samples per yielded block. The last block may be shorter.
 
-        bitgroups = [''.join(bitstr[i:i+self.order]) for i in range(0, len(bitstr[:-2]), self.order)]
+            Yields:
+                np.array: Blocks of the mixed modulated signal.
+        '''
+        samples_per_symbol, _, rrc = self.__rrc_filter()
+        symbols_per_pass = max(1, block_size // samples_per_symbol)
+
+        pending_bits = np.zeros(0, dtype=np.uint8)
+        tail = np.zeros(len(rrc) - 1, dtype=complex)
+        sample_index = 0
+        output = []
+        output_length = 0
+
+        def shape(symbols):
+            nonlocal tail, sample_index
+            I, Q = self.symbols2iq(symbols)
+            shaped = PulseShaper(I + 1j * Q, rrc, samples_per_symbol, method=self.shaping_method)
+            shaped[:len(tail)] += tail
+
+            ready_length = len(symbols) * samples_per_symbol
+            tail = shaped[ready_length:].copy()
+            I_FC, Q_FC, _ = self.__upconvert(shaped[:ready_length], sample_index)
+            sample_index += ready_length
+            return I_FC + Q_FC
+
+        def emit(samples, final=False):
+            # Collect samples and cut every complete block_size block (everything if final)
+            nonlocal output, output_length
+            output.append(samples)
+            output_length += len(samples)
+            if output_length < block_size and not (final and output_length):
+                return []
+
+            pending = np.concatenate(output)
+            stop = len(pending) if final else len(pending) - len(pending) % block_size
+            output, output_length = [pending[stop:]], len(pending) - stop
+            return [pending[start:start + block_size] for start in range(0, stop, block_size)]
+
+        for chunk in byte_chunks:
+            bits = np.concatenate([pending_bits, np.unpackbits(np.frombuffer(bytes(chunk), dtype=np.uint8))])
+            whole = len(bits) - len(bits) % self.order
+            pending_bits = bits[whole:]
+            symbols = self.bits2symbols(bits[:whole])
+
+            for start in range(0, len(symbols), symbols_per_pass):
+                yield from emit(shape(symbols[start:start + symbols_per_pass]))
+
+        # Pad the last partial symbol with zeros as msg2bits does, then flush the filter tail
+        if len(pending_bits):
+            padded = np.concatenate([pending_bits, np.zeros(self.order - len(pending_bits), dtype=np.uint8)])
+            yield from emit(shape(self.bits2symbols(padded)))
+        I_FC, Q_FC, _ = self.__upconvert(tail, sample_index)
+        yield from emit(I_FC + Q_FC, final=True)
+
+    def __rrc_filter(self):
+        '''
+            Returns the samples per symbol, RRC delay and RRC filter taps of the modulator.
+        '''
+        samples_per_symbol = int(self.symbol_period * self.sampling_rate)
+        RRC_delay = 3 * self.symbol_period
+        
+        # Simulated SRRC filter and pulse shaping (replace with actual filter for real use)
+        _, rrc = RRCFilter(
+            N=int(2*self.sampling_rate*RRC_delay),
+            alpha=self.RRC_alpha,
+            Ts=self.symbol_period, 
+            Fs=self.sampling_rate
+        )
+        return samples_per_symbol, RRC_delay, rrc
 
-        I = np.array([qam_constellations[group]['I'] for group in bitgroups])
-        Q = np.array([qam_constellations[group]['Q'] for group in bitgroups])
+    def __upconvert(self, Shaped_Pulse, start_index=0):
+        '''
+            Upconverts a shaped baseband segment starting at absolute sample `start_index` to the carrier.
+            In baseband mode there is no carrier and I_FC + Q_FC is the complex envelope itself.
 
-        return self.__modulator_calculations(I, Q, bitgroups)
+            Returns:
+                tuple: I_FC, Q_FC and the time axis of the segment.
+        '''
+        t_Mixed_Signal = np.arange(start_index, start_index + len(Shaped_Pulse), dtype=float) / self.sampling_rate
+        if self.baseband:
+            return Shaped_Pulse.real, 1j * Shaped_Pulse.imag, t_Mixed_Signal
+        carrier = CarrierPhasor(self.carrier_freq, self.sampling_rate, len(Shaped_Pulse), start_index)
+        I_FC = Shaped_Pulse.real * carrier.real
+        Q_FC = Shaped_Pulse.imag * -carrier.imag
+        return I_FC, Q_FC, t_Mixed_Signal
     
-    def __modulator_calculations(self, I, Q, bitgroups):
+    def __modulator_calculations(self, I, Q, symbols):
         """
-            Performs the modulation calculations for the given I and Q components and bit groups.
+            Performs the modulation calculations for the given I and Q components and symbols.
 
             Args:
                 I (np.array): In-phase component of the signal.
                 Q (np.array): Quadrature component of the signal.
-                bitgroups (list): List of bit groups of size `order`.
+                symbols (np.array): Integer symbol indices, one per symbol period.
 
             Returns:
                 tuple: A tuple containing:
@@ -170,47 +356,24 @@ class Modulator:
                 - RRC_delay (float): Delay due to the Root Raised Cosine Filter.
         """
 
-        samples_per_symbol = int(self.symbol_period * self.sampling_rate)
-        RRC_delay = 3 * self.symbol_period
+        samples_per_symbol, RRC_delay, rrc = self.__rrc_filter()
         
-        # Simulated SRRC filter and pulse shaping (replace with actual filter for real use)
-        _, rrc = RRCFilter(
-            N=int(2*self.sampling_rate*RRC_delay),
-            alpha=self.RRC_alpha,
-            Ts=self.symbol_period, 
-            Fs=self.sampling_rate
-        )
-        
-        shaped_pulse_length = len(bitgroups) * samples_per_symbol + len(rrc) - 1
+        shaped_pulse_length = len(symbols) * samples_per_symbol + len(rrc) - 1
         
         impulses = I + 1j * Q
 
-        # Precompute unique pulse shapes for the LUT
-        unique_impulses, unique_indices = np.unique(impulses, return_inverse=True)
-        pulseLUT = unique_impulses[:, None] * rrc  # Broadcasting over RRC filter
-
-        # Create a sparse Dirac comb using broadcasting
-        dirac_indices = np.arange(len(I)) * samples_per_symbol
-        Dirac_Comb = np.zeros(shaped_pulse_length, dtype=complex)
-        Dirac_Comb[dirac_indices] = impulses
-
-        # Construct the shaped pulse using broadcasting
-        Shaped_Pulse = np.zeros(shaped_pulse_length, dtype=complex)
-
-        # Add contributions from each pulse (broadcast the RRC filter)
-        for idx, impulse_idx in enumerate(unique_indices):
-            start_idx = idx * samples_per_symbol
-            Shaped_Pulse[start_idx:start_idx + len(rrc)] += pulseLUT[impulse_idx]
-
-        t_Mixed_Signal = np.arange(0, shaped_pulse_length, dtype=float) / self.sampling_rate
+        # Upsample and filter the symbols in a single polyphase/FFT pass
+        Shaped_Pulse = PulseShaper(impulses, rrc, samples_per_symbol, method=self.shaping_method)
 
         ###Upscaling the signal to the carrier frequency###
         I_processed = Shaped_Pulse.real
         Q_processed = Shaped_Pulse.imag
-        I_FC = I_processed * np.cos(2 * np.pi * self.carrier_freq * t_Mixed_Signal)
-        Q_FC = Q_processed * -np.sin(2 * np.pi * self.carrier_freq * t_Mixed_Signal)
+        I_FC, Q_FC, t_Mixed_Signal = self.__upconvert(Shaped_Pulse)
 
         if self.IQ_Return == True:
+            # Dirac comb is only needed for the IQ detail plot
+            Dirac_Comb = np.zeros(shaped_pulse_length, dtype=complex)
+            Dirac_Comb[np.arange(len(I)) * samples_per_symbol] = impulses
             return t_Mixed_Signal, Shaped_Pulse, I_FC, Q_FC, I_processed, Q_processed, Dirac_Comb, RRC_delay
         
         return t_Mixed_Signal, I_FC + Q_FC
@@ -224,10 +387,19 @@ class Modulator:
                 modulated_signal (np.array): Modulated signal to be saved
         '''
         assert self.save_signal == True, "Set save_signal to True to save the modulated signal before calling function."
+        assert self.baseband == False, "Complex baseband signals cannot be saved as WAV files."
         modulated_signal /= 2
         modulated_signal = np.array(modulated_signal, dtype=np.float32)
 
-        wav.write(filename, self.sampling_rate, modulated_signal)
+        wav.write(filename, int(round(self.sampling_rate)), modulated_signal)
+        # Carrier and rates are stored with the samples, so the demodulator does not have to derive them
+        write_metadata(filename, {
+            'modulation_mode': self.modulation_mode,
+            'carrier_freq': self.carrier_freq,
+            'sampling_rate': self.sampling_rate,
+            'bit_rate': self.bit_rate,
+            'oversampling_factor': self.oversampling_factor
+        })
         
     def digital_modulated_plot(self, digital_signal, x_axis_digital, t_axis, modulated_signal):
         '''
@@ -239,6 +411,7 @@ class Modulator:
                 modulated_signal (np.array): Modulated signal to be plotted
                 t_axis (np.array): Time axis of the modulated signal
         '''
+        from matplotlib import pyplot as plt
         fig, axs = plt.subplots(2, 1, figsize=(5, 5))
         fig.suptitle(f'Digital and Modulated Signals: {self.modulation_mode} Signal @ {self.carrier_freq} Hz')
         axs[0].step(x_axis_digital, digital_signal, where='post')
@@ -269,6 +442,7 @@ class Modulator:
         assert self.IQ_Return == True, "IQ_Return must be True to plot I and Q components"
         
         ###### Figure Setup ######
+        from matplotlib import pyplot as plt
         fig, ax = plt.subplots(3, 2, constrained_layout=True)
         fig.suptitle(f'Modulated Signal Details: {self.modulation_mode} Signal @ {self.carrier_freq} Hz')
         
@@ -0,0 +1,75 @@
+import numpy as np
+from fractions import Fraction
+from functools import lru_cache
+
+NCO_CACHE_SIZE = 16
+MAX_TABLE_LENGTH = 2**16  # Longest carrier period (in samples) that is tabulated
+ROTATOR_BLOCK = 1024      # Samples per block of the recursive rotator
+
+def CarrierPhasor(frequency, sampling_rate, num_samples, start_index=0):
+    """
+    Numerically controlled oscillator. Returns exp(j*2*pi*frequency*n/sampling_rate) for the absolute
+    sample indices n = start_index ... start_index+num_samples-1.
+
+    When frequency/sampling_rate is a ratio p/q with q <= MAX_TABLE_LENGTH the carrier repeats every q
+    samples, so one period is tabulated once and tiled. Other ratios use a block rotator: one cached block
+    of ROTATOR_BLOCK phasors multiplied by one rotation per block. Either way no sin/cos/exp is evaluated
+    per sample. Tables are cached, statistics from CarrierPhasor.cache_info().
+
+    Parameters
+    ----------
+    frequency : float
+        Oscillator frequency in Hz, may be negative.
+
+    sampling_rate : float
+        Sampling Rate in Hz.
+
+    num_samples : int
+        Number of samples to generate.
+
+    start_index : int
+        Absolute index of the first sample, so consecutive blocks continue the same phase.
+
+    Returns
+    ---------
+
+    phasor : 1-D ndarray of complex
+        The oscillator samples.
+    """
+    ratio = Fraction(frequency) / Fraction(sampling_rate)
+    num_samples = int(num_samples)
+
+    if ratio.denominator <= MAX_TABLE_LENGTH:
+        table = _period_table(ratio.numerator % ratio.denominator, ratio.denominator)
+        offset = start_index % len(table)
+        repeats = -(-(offset + num_samples) // len(table))
+        return np.tile(table, repeats)[offset:offset + num_samples]
+
+    cycles_per_sample = float(ratio)
+    block = _rotator_block(cycles_per_sample)
+    num_blocks = -(-num_samples // ROTATOR_BLOCK)
+    block_starts = start_index + np.arange(num_blocks) * ROTATOR_BLOCK
+    rotations = np.exp(2j * np.pi * np.mod(cycles_per_sample * block_starts, 1))
+    return (rotations[:, None] * block[None, :]).reshape(-1)[:num_samples]
+
+@lru_cache(maxsize=NCO_CACHE_SIZE)
+def _period_table(numerator, denominator):
+    table = np.exp(2j * np.pi * (np.arange(denominator) * numerator % denominator) / denominator)
+    table.flags.writeable = False
+    return table
+
+@lru_cache(maxsize=NCO_CACHE_SIZE)
+def _rotator_block(cycles_per_sample):
+    block = np.exp(2j * np.pi * cycles_per_sample * np.arange(ROTATOR_BLOCK))
+    block.flags.writeable = False
+    return block
+
+def _cache_info():
+    return _period_table.cache_info(), _rotator_block.cache_info()
+
+def _cache_clear():
+    _period_table.cache_clear()
+    _rotator_block.cache_clear()
+
+CarrierPhasor.cache_info = _cache_info
+CarrierPhasor.cache_clear = _cache_clear
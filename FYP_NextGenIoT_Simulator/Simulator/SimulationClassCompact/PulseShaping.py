@@ -0,0 +1,171 @@
+import numpy as np
+import scipy.signal as sig
+from numpy.lib.stride_tricks import sliding_window_view
+
+def PulseShaper(impulses, pulse, samples_per_symbol, method='auto'):
+    """
+    Upsamples a symbol vector and applies a pulse shaping filter in a single pass.
+
+    Equivalent to placing every symbol on a Dirac comb spaced `samples_per_symbol` apart and
+    adding a scaled copy of `pulse` for each symbol, without a Python loop over the symbols.
+
+    Parameters
+    ----------
+    impulses : 1-D ndarray
+        Symbol values (I + jQ), one per symbol period.
+
+    pulse : 1-D ndarray of floats
+        Impulse response of the pulse shaping filter (e.g. RRC taps).
+
+    samples_per_symbol : int
+        Upsampling factor between the symbol rate and the sampling rate.
+
+    method : str
+        'polyphase', 'fft' or 'auto'. 'auto' compares the per-sample cost of both engines
+        for the given symbol count and filter span and picks the cheaper one.
+
+    Returns
+    ---------
+
+    Shaped_Pulse : 1-D ndarray of complex
+        Shaped signal of length len(impulses)*samples_per_symbol + len(pulse) - 1.
+    """
+    impulses = np.asarray(impulses, dtype=complex)
+    pulse = np.asarray(pulse, dtype=float)
+    shaped_pulse_length = len(impulses) * samples_per_symbol + len(pulse) - 1
+
+    if method == 'auto':
+        method = select_method(len(impulses), len(pulse), samples_per_symbol)
+
+    if method == 'polyphase':
+        shaped = _polyphase_shaper(impulses, pulse, samples_per_symbol)
+    elif method == 'fft':
+        comb = np.zeros(len(impulses) * samples_per_symbol, dtype=complex)
+        comb[::samples_per_symbol] = impulses
+        shaped = sig.fftconvolve(comb, pulse)
+    else:
+        raise ValueError(f"Invalid pulse shaping method: {method}")
+
+    return shaped[:shaped_pulse_length]
+
+def select_method(num_symbols, pulse_length, samples_per_symbol):
+    """
+    Picks the cheaper shaping engine for a given symbol count.
+
+    The polyphase pass costs 2 multiply-adds per filter span (in symbols) per output sample,
+    the FFT pass costs roughly 8*log2(N) per output sample for an N sample signal.
+    """
+    span = -(-pulse_length // samples_per_symbol)
+    signal_length = max(num_symbols * samples_per_symbol + pulse_length - 1, 2)
+    return 'fft' if 2 * span > 8 * np.log2(signal_length) else 'polyphase'
+
+def DecimatingFilter(signal, taps, decimation, phase=0, output_length=None, method='auto'):
+    """
+    Filters a signal along its last axis and keeps every `decimation`-th output sample, starting at `phase`.
+
+    Equivalent to fftconvolve(signal, taps)[..., phase:output_length:decimation], but the polyphase engine
+    only computes the samples that are kept, so a matched filter decimating to the symbol rate costs
+    len(taps)/decimation multiply-adds per input sample.
+
+    Parameters
+    ----------
+    signal : N-D ndarray
+        Input signal(s), filtered along the last axis.
+
+    taps : 1-D ndarray of floats
+        Impulse response of the filter (e.g. composite low-pass and RRC taps).
+
+    decimation : int
+        Decimation factor, 1 for full rate output.
+
+    phase : int
+        Index (in full rate samples of the full convolution) of the first kept output sample.
+
+    output_length : int
+        Full rate length at which the output is cut. Defaults to the full convolution length.
+
+    method : str
+        'polyphase', 'fft' or 'auto'. 'auto' picks the cheaper engine as `select_method` does.
+
+    Returns
+    ---------
+
+    filtered : N-D ndarray of complex
+        The kept output samples, ceil((output_length - phase)/decimation) along the last axis.
+    """
+    signal = np.asarray(signal)
+    taps = np.asarray(taps, dtype=float)
+    num_samples = signal.shape[-1]
+    if output_length is None:
+        output_length = num_samples + len(taps) - 1
+
+    if method == 'auto':
+        method = select_method(num_samples // decimation, len(taps), decimation)
+
+    if method == 'fft':
+        taps = taps.reshape((1,) * (signal.ndim - 1) + (-1,))
+        return sig.fftconvolve(signal, taps, axes=-1)[..., phase:output_length:decimation]
+    elif method == 'polyphase':
+        return _polyphase_decimator(signal, taps, decimation, phase, output_length)
+    raise ValueError(f"Invalid filtering method: {method}")
+
+def _polyphase_decimator(signal, taps, decimation, phase, output_length):
+    """
+    Polyphase decimating FIR as `span` matrix-vector products.
+
+    Kept output q is the dot product of the reversed taps with the input window starting at full rate
+    index phase + q*decimation - (len(taps)-1). Cutting the zero padded input into rows of `decimation`
+    samples turns every window into `span` consecutive rows, so the output is the sum over k of the
+    rows shifted by k times the k-th polyphase component of the reversed taps.
+    """
+    num_samples = signal.shape[-1]
+    num_outputs = max(0, -(-(output_length - phase) // decimation))
+    span = -(-len(taps) // decimation)
+
+    reversed_taps = np.zeros(span * decimation)
+    reversed_taps[:len(taps)] = taps[::-1]
+    polyphase_matrix = reversed_taps.reshape(span, decimation)
+
+    # padded[k] is the input sample at index phase - (len(taps)-1) + k, zero outside the signal
+    rows = num_outputs + span - 1
+    padded = np.zeros(signal.shape[:-1] + (rows * decimation,), dtype=np.result_type(signal, complex))
+    start = phase - (len(taps) - 1)
+    first, last = max(start, 0), min(num_samples, start + rows * decimation)
+    if last > first:
+        padded[..., first - start:last - start] = signal[..., first:last]
+    padded = padded.reshape(signal.shape[:-1] + (rows, decimation))
+
+    filtered = np.zeros(signal.shape[:-1] + (num_outputs,), dtype=padded.dtype)
+    for k in range(span):
+        filtered += padded[..., k:k + num_outputs, :] @ polyphase_matrix[k]
+    return filtered
+
+def _polyphase_shaper(impulses, pulse, samples_per_symbol):
+    """
+    Polyphase pulse shaping as a single matrix product.
+
+    Output symbol period m is the sum over k of impulses[m-k] * pulse[k*sps:(k+1)*sps], i.e. a
+    (symbols x span) sliding window of the impulses times the (span x sps) polyphase pulse matrix.
+    I and Q are stacked into one real GEMM that writes the interleaved complex output directly.
+    """
+    num_symbols = len(impulses)
+    span = -(-len(pulse) // samples_per_symbol)
+    # Output symbol periods needed to cover num_symbols*sps + len(pulse) - 1 samples
+    num_outputs = num_symbols + -(-(len(pulse) - 1) // samples_per_symbol)
+
+    # Polyphase components, laid out so that the product is interleaved (real, imag) pairs
+    phases = np.zeros(span * samples_per_symbol)
+    phases[:len(pulse)] = pulse
+    phases = phases.reshape(span, samples_per_symbol)
+    polyphase_matrix = np.zeros((2 * span, samples_per_symbol, 2))
+    polyphase_matrix[:span, :, 0] = phases
+    polyphase_matrix[span:, :, 1] = phases
+    polyphase_matrix = polyphase_matrix.reshape(2 * span, 2 * samples_per_symbol)
+
+    # windows[m, k] = impulses[m - k]
+    padded = np.zeros(num_outputs + span - 1, dtype=complex)
+    padded[span - 1:span - 1 + num_symbols] = impulses
+    windows = sliding_window_view(padded, span)[:, ::-1]
+    windows = np.concatenate([windows.real, windows.imag], axis=1)
+
+    return (windows @ polyphase_matrix).view(complex).reshape(-1)
@@ -1,9 +1,16 @@
-from numpy import pi,sin,cos,sqrt,arange,zeros
+from numpy import pi,sin,cos,sqrt,arange,sinc,isclose,errstate,where
+from functools import lru_cache
+
+RRC_CACHE_SIZE = 64
 
 def RRCFilter(N, alpha, Ts, Fs):
     """
     Generates a root raised cosine (RRC) filter (FIR) impulse response. Adapted from commpy due to small bug, filter does not extend to full range of samples.
 
+    Taps are computed in closed form over the whole time axis and cached on (N, alpha, Ts, Fs), so
+    repeated modulate/demodulate calls with the same parameters reuse the same arrays. Returned arrays
+    are read-only; copy them before modifying. Cache statistics are available from RRCFilter.cache_info().
+
     Parameters
     ----------
     N : int
@@ -28,24 +35,82 @@ def RRCFilter(N, alpha, Ts, Fs):
     h_rrc : 1-D ndarray of floats
         Impulse response of the root raised cosine filter.
     """
+    return _rrc_taps(int(N), float(alpha), float(Ts), float(Fs))
+
+def RCFilter(N, alpha, Ts, Fs):
+    """
+    Generates a raised cosine (RC) filter (FIR) impulse response, i.e. the cascade of a transmit and a
+    receive RRC filter. Cached in the same way as RRCFilter, statistics from RCFilter.cache_info().
+
+    Parameters
+    ----------
+    N : int
+        Length of the filter in samples.
+
+    alpha : float
+        Roll off factor (Valid values are [0, 1]).
+
+    Ts : float
+        Symbol period in seconds.
+
+    Fs : float
+        Sampling Rate in Hz.
+
+    Returns
+    ---------
+
+    time_idx : 1-D ndarray of floats
+        Array containing the time indices, in seconds, for
+        the impulse response.
+
+    h_rc : 1-D ndarray of floats
+        Impulse response of the raised cosine filter.
+    """
+    return _rc_taps(int(N), float(alpha), float(Ts), float(Fs))
+
+def _time_axis(N, Fs):
     T_delta = 1/float(Fs)
-    time_idx = ((arange(N+1)-N/2))*T_delta
-    sample_num = arange(N+1)
-    h_rrc = zeros(N+1, dtype=float)
-
-    for x in sample_num:
-        t = (x-N/2)*T_delta
-        if t == 0.0:
-            h_rrc[x] = 1.0 - alpha + (4*alpha/pi)
-        elif alpha != 0 and t == Ts/(4*alpha):
-            h_rrc[x] = (alpha/sqrt(2))*(((1+2/pi)* \
-                    (sin(pi/(4*alpha)))) + ((1-2/pi)*(cos(pi/(4*alpha)))))
-        elif alpha != 0 and t == -Ts/(4*alpha):
-            h_rrc[x] = (alpha/sqrt(2))*(((1+2/pi)* \
-                    (sin(pi/(4*alpha)))) + ((1-2/pi)*(cos(pi/(4*alpha)))))
-        else:
-            h_rrc[x] = (sin(pi*t*(1-alpha)/Ts) +  \
-                    4*alpha*(t/Ts)*cos(pi*t*(1+alpha)/Ts))/ \
-                    (pi*t*(1-(4*alpha*t/Ts)*(4*alpha*t/Ts))/Ts)
-
-    return time_idx, h_rrc
\ No newline at end of file
+    return (arange(N+1)-N/2)*T_delta
+
+def _singular_mask(t, t_singular):
+    return isclose(abs(t), t_singular, rtol=1e-9, atol=0)
+
+@lru_cache(maxsize=RRC_CACHE_SIZE)
+def _rrc_taps(N, alpha, Ts, Fs):
+    time_idx = _time_axis(N, Fs)
+    t = time_idx
+
+    # General expression, singular points are overwritten below
+    with errstate(divide='ignore', invalid='ignore'):
+        h_rrc = (sin(pi*t*(1-alpha)/Ts) + \
+                4*alpha*(t/Ts)*cos(pi*t*(1+alpha)/Ts))/ \
+                (pi*t*(1-(4*alpha*t/Ts)*(4*alpha*t/Ts))/Ts)
+
+    if alpha != 0:
+        h_rrc[_singular_mask(t, Ts/(4*alpha))] = (alpha/sqrt(2))*(((1+2/pi)* \
+                (sin(pi/(4*alpha)))) + ((1-2/pi)*(cos(pi/(4*alpha)))))
+    h_rrc[t == 0.0] = 1.0 - alpha + (4*alpha/pi)
+
+    time_idx.flags.writeable = False
+    h_rrc.flags.writeable = False
+    return time_idx, h_rrc
+
+@lru_cache(maxsize=RRC_CACHE_SIZE)
+def _rc_taps(N, alpha, Ts, Fs):
+    time_idx = _time_axis(N, Fs)
+    t = time_idx
+
+    with errstate(divide='ignore', invalid='ignore'):
+        h_rc = sinc(t/Ts) * cos(pi*alpha*t/Ts) / (1-(2*alpha*t/Ts)**2)
+
+    if alpha != 0:
+        h_rc = where(_singular_mask(t, Ts/(2*alpha)), (pi/4)*sinc(1/(2*alpha)), h_rc)
+
+    time_idx.flags.writeable = False
+    h_rc.flags.writeable = False
+    return time_idx, h_rc
+
+RRCFilter.cache_info = _rrc_taps.cache_info
+RRCFilter.cache_clear = _rrc_taps.cache_clear
+RCFilter.cache_info = _rc_taps.cache_info
+RCFilter.cache_clear = _rc_taps.cache_clear
@@ -1,13 +1,153 @@
-from matplotlib import pyplot as plt
-from matplotlib.ticker import MultipleLocator
 from Simulator.SimulationClassCompact.ModulationClass import Modulator
 from Simulator.SimulationClassCompact.DemodulationClass import Demodulator
 import Simulator.SimulationClassCompact.ChannelClass as Channel
 
-from numpy import array,arange
+from numpy import arange,ndarray,uint8,zeros,concatenate,count_nonzero,sqrt,random as nprandom
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+# Only the symbol decisions are used by the sweeps, so the matched filter runs at the symbol rate
+DECISION_SAMPLES_PER_SYMBOL = 1
+
+def cell_seed(seed, mode, snr_index, *batch_index):
+    """
+    Derives the deterministic SeedSequence of one (mode, SNR) cell, or of one Monte-Carlo batch
+    within a cell, from the user seed.
+
+    The sequence is the child SeedSequence(seed).spawn() would hand out at position
+    (mode, SNR[, batch]), built directly from its spawn key so it does not depend on the order in
+    which cells are executed. The serial and the parallel sweep therefore produce identical noise
+    realisations. Returns None if seed is None.
+    """
+    if seed is None:
+        return None
+    mode_index = list(Modulator.modulation_modes).index(mode)
+    return nprandom.SeedSequence(seed, spawn_key=(mode_index, snr_index, *batch_index))
+
+def stream_seeds(seed, count):
+    """
+    Splits a cell SeedSequence into `count` independent child sequences, one per random stream
+    (bits, AWGN, additional channels). Returns None for every stream if seed is None.
+    """
+    return seed.spawn(count) if seed is not None else [None] * count
+
+def wilson_interval(errors, bits, z=1.96):
+    """
+    Wilson score confidence interval of a BER estimate. Defaults to 95% confidence.
+
+    Returns (lower, upper). Unlike the normal approximation the interval stays inside [0, 1]
+    and is meaningful at 0 observed errors.
+    """
+    if bits == 0:
+        return 0.0, 1.0
+    p = errors / bits
+    denominator = 1 + z**2 / bits
+    centre = (p + z**2 / (2 * bits)) / denominator
+    half_width = z * sqrt(p * (1 - p) / bits + z**2 / (4 * bits**2)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+def cell_ber(demodulator, modulated_signal, comparison_string, snr, seed, channel_pipeline):
+    """
+    Computes the BER of a single (mode, SNR) cell. Shared by the serial and the parallel sweep.
+    `channel_pipeline` is the ChannelPipeline of the additional channels, or None.
+    """
+    noise_seed, channel_seed = stream_seeds(seed, 2)
+    channel = Channel.SimpleGWNChannel_dB(snr, seed=noise_seed)
+    signal = channel.add_noise(modulated_signal)
+
+    if channel_pipeline is not None:
+        signal = channel_pipeline.apply(signal, rng=nprandom.default_rng(channel_seed), inplace=True)
+
+    demodulated_signal = demodulator.demodulate(signal)
+    demodulated_bits = demodulator.demapping(demodulated_signal)[1]
+    return count_nonzero(comparison_string != demodulated_bits[:len(comparison_string)])
+
+def monte_carlo_cell(modulator, demodulator, snr, seed, mode, snr_index, target_errors, max_bits, batch_bits, channel_pipeline):
+    """
+    Monte-Carlo BER of a single (mode, SNR) cell.
+
+    Random bit blocks of `batch_bits` bits are modulated, passed through the channel and demodulated
+    until `target_errors` errors or `max_bits` bits have been accumulated. Every batch draws its
+    bits and noise from its own seed, so the result does not depend on execution order.
+    `snr` is the passband SNR, baseband modulators apply their `snr_offset`.
+
+    Returns (error_bits, total_bits).
+    """
+    batch_bits -= batch_bits % modulator.order
+    error_bits, total_bits, batch_index = 0, 0, 0
+    
+    while error_bits < target_errors and total_bits < max_bits:
+        bits_seed, noise_seed, channel_seed = stream_seeds(cell_seed(seed, mode, snr_index, batch_index), 3)
+        bits = nprandom.default_rng(bits_seed).integers(0, 2, batch_bits, dtype=uint8)
+        
+        # Modulator bit array format, including the two trailing padding bits
+        bit_string = concatenate([bits, zeros(2, dtype=uint8)])
+        modulated_signal = modulator.modulate(bit_string)[1]
+        
+        channel = Channel.SimpleGWNChannel_dB(snr + modulator.snr_offset, seed=noise_seed)
+        signal = channel.add_noise(modulated_signal)
+        if channel_pipeline is not None:
+            signal = channel_pipeline.apply(signal, rng=nprandom.default_rng(channel_seed), inplace=True)
+        
+        demodulated_signal = demodulator.demodulate(signal)
+        demodulated_bits = demodulator.decision_demapper(demodulated_signal[:-(6*demodulator.symbol_step)])
+        
+        compared = min(len(bits), len(demodulated_bits))
+        error_bits += count_nonzero(bits[:compared] != demodulated_bits[:compared])
+        total_bits += compared
+        batch_index += 1
+    
+    return error_bits, total_bits
+
+# Modulators and Demodulators are reused by every cell a worker process runs
+_worker_modulators = {}
+_worker_demodulators = {}
+
+def _shared_array(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    return block, ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _parallel_cell(mode, bit_rate, carrier_freq, sampling_rate, baseband, signal_spec, comparison_spec, snr, seed, channel_pipeline):
+    """
+    Worker entry point of the parallel sweep. Attaches to the shared modulated waveform and
+    comparison bits instead of receiving them pickled.
+    """
+    key = (mode, bit_rate, carrier_freq, sampling_rate, baseband)
+    if key not in _worker_demodulators:
+        _worker_demodulators[key] = Demodulator(mode, bit_rate, sampling_rate, baseband=baseband, carrier_freq=carrier_freq,
+                                                     output_samples_per_symbol=DECISION_SAMPLES_PER_SYMBOL)
+
+    signal_block, modulated_signal = _shared_array(*signal_spec)
+    comparison_block, comparison_string = _shared_array(*comparison_spec)
+    try:
+        return cell_ber(_worker_demodulators[key], modulated_signal, comparison_string, snr, seed, channel_pipeline)
+    finally:
+        del modulated_signal, comparison_string
+        signal_block.close()
+        comparison_block.close()
+
+def _parallel_monte_carlo_cell(mode, bit_rate, carrier_freq, sampling_rate, baseband, samples_per_symbol, snr, seed, snr_index, target_errors, max_bits, batch_bits, channel_pipeline):
+    """
+    Worker entry point of the parallel Monte-Carlo sweep. Nothing is shared, every batch is generated in the worker.
+    """
+    key = (mode, bit_rate, carrier_freq, sampling_rate, baseband, samples_per_symbol)
+    if key not in _worker_modulators:
+        _worker_modulators[key] = Modulator(mode, bit_rate, carrier_freq, baseband=baseband, samples_per_symbol=samples_per_symbol, sampling_rate=sampling_rate)
+        _worker_demodulators[key] = Demodulator(mode, bit_rate, _worker_modulators[key].sampling_rate, baseband=baseband, carrier_freq=carrier_freq,
+                                                     output_samples_per_symbol=DECISION_SAMPLES_PER_SYMBOL)
+    
+    return monte_carlo_cell(_worker_modulators[key], _worker_demodulators[key], snr, seed, mode, snr_index,
+                            target_errors, max_bits, batch_bits, channel_pipeline)
+
+def _to_shared(data):
+    block = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    ndarray(data.shape, dtype=data.dtype, buffer=block.buf)[:] = data
+    return block, (block.name, data.shape, data.dtype)
 
 class SNRBERTest:
-    def __init__(self,selected_modes,bit_rate,carrier_freq,snr_up,snr_down,seed,selected_channels=None,channel_params=None):
+    def __init__(self,selected_modes,bit_rate,carrier_freq,snr_up,snr_down,seed,selected_channels=None,channel_params=None,parallel=False,max_workers=None,
+                 monte_carlo=False,target_errors=100,max_bits=1000000,batch_bits=10000,
+                 batched=False,batch_memory=2**28,baseband=False,samples_per_symbol=8,sampling_rate=None):
         """
         Initialize the SNRBERTest object.
 
@@ -24,7 +164,7 @@ class SNRBERTest:
         snr_down : int
             Lower limit of the SNR test range (dB).
         seed : int
-            Seed for the AWGN channel.
+            Seed for the AWGN channel. Every (mode, SNR) cell derives its own seed from it.
             
         Optional Inputs [Both must be provided]
         ----------
@@ -32,6 +172,48 @@ class SNRBERTest:
             List of channels to be applied to the signal. Defaults to None.
         channel_params : dict, optional
             Dictionary of channel parameters. Defaults to None.
+            The channels are compiled once per mode into a Channel.ChannelPipeline.
+
+        Parallel Execution
+        ----------
+        parallel : bool, optional
+            Run each (mode, SNR) cell on a process pool. Results are identical to the serial sweep. Defaults to False.
+        max_workers : int, optional
+            Number of worker processes. Defaults to the number of CPUs.
+        
+        Monte-Carlo Mode
+        ----------
+        monte_carlo : bool, optional
+            Estimate the BER from random bit blocks instead of the message. Defaults to False.
+        target_errors : int, optional
+            Stop a (mode, SNR) cell once this many bit errors are accumulated. Defaults to 100.
+        max_bits : int, optional
+            Stop a (mode, SNR) cell once this many bits are simulated. Defaults to 1000000.
+        batch_bits : int, optional
+            Number of random bits per modulated block. Defaults to 10000.
+        
+        Batched Mode
+        ----------
+        batched : bool, optional
+            Generate the noisy signals of all SNR values as one 2-D block per mode. Uses one noise stream per mode,
+            so results differ from the per cell seeded sweep. Defaults to False.
+        batch_memory : int, optional
+            Upper bound in bytes of one noisy block, larger SNR ranges are processed in several blocks. Defaults to 256 MB.
+        
+        Baseband Mode
+        ----------
+        baseband : bool, optional
+            Simulate the complex baseband equivalent at `samples_per_symbol` samples per symbol instead of the
+            passband signal. The SNR axis keeps the passband definition, so the BER curves are statistically
+            identical for the AWGN channel. Defaults to False.
+        samples_per_symbol : int, optional
+            Samples per symbol in baseband mode. Defaults to 8.
+        
+        Sampling Rate
+        ----------
+        sampling_rate : float or str, optional
+            Passband sampling rate, 'minimum' for the cheapest rate that satisfies Nyquist for the carrier plus
+            signal bandwidth. Defaults to None, i.e. 20x the carrier frequency.
         
         Attributes
         ----------
@@ -43,27 +225,56 @@ class SNRBERTest:
             Dictionary of Demodulator objects for each modulation mode.
         snr_test_range : numpy array of int
             Array of SNR values to be tested (dB).
-        channels : dict of AWGN
-            Dictionary of AWGN channel objects for each SNR value.
+        seed : int
+            User seed from which the per cell AWGN seeds are derived.
         modulated_signals : dict of tuple of numpy array
             Dictionary of modulated signals for each modulation mode.
         ber_dict : dict of list of float
             Dictionary of BER values for each modulation mode.
+        ber_ci_dict : dict of list of tuple of float
+            Dictionary of Wilson 95% confidence intervals of the BER values (Monte-Carlo mode only).
+        bits_dict : dict of list of int
+            Dictionary of the number of simulated bits per SNR value (Monte-Carlo mode only).
+        channel_pipelines : dict of ChannelPipeline
+            Dictionary of the additional channel chain for each modulation mode, None if no channels are selected.
         fig : matplotlib figure
-            Figure to plot the BER vs SNR.
+            Figure to plot the BER vs SNR. Created by plotSNRBER, None until then.
         ax : matplotlib axis
-            Axis to plot the BER vs SNR.
+            Axis to plot the BER vs SNR. Created by plotSNRBER, None until then.
         """
         self.selected_modes = selected_modes
-        self.modulators = {mode: Modulator(mode, bit_rate, carrier_freq) for mode in selected_modes}
-        self.demodulators = {mode: Demodulator(mode, bit_rate, self.modulators[mode].sampling_rate) for mode in selected_modes}
+        self.modulators = {mode: Modulator(mode, bit_rate, carrier_freq, baseband=baseband, samples_per_symbol=samples_per_symbol, sampling_rate=sampling_rate)
+                           for mode in selected_modes}
+        self.demodulators = {mode: Demodulator(mode, bit_rate, self.modulators[mode].sampling_rate, baseband=baseband, carrier_freq=carrier_freq,
+                                               output_samples_per_symbol=DECISION_SAMPLES_PER_SYMBOL)
+                             for mode in selected_modes}
         self.snr_test_range = arange(snr_down, snr_up + 1)
-        self.channels = {snr: Channel.SimpleGWNChannel_dB(snr, seed=seed) for snr in self.snr_test_range}
+        self.seed = seed
+        self.bit_rate = bit_rate
+        
+        self.parallel = parallel
+        self.max_workers = max_workers
+        
+        self.carrier_freq = carrier_freq
+        self.monte_carlo = monte_carlo
+        self.target_errors = target_errors
+        self.max_bits = max_bits
+        self.batch_bits = batch_bits
+        
+        self.batched = batched
+        self.batch_memory = batch_memory
+        
+        self.baseband = baseband
+        self.samples_per_symbol = samples_per_symbol
+        self.sampling_rate = sampling_rate
         
         self.modulated_signals = {mode: (None, None) for mode in selected_modes}
         self.ber_dict = {mode: [] for mode in selected_modes}
+        self.ber_ci_dict = {mode: [] for mode in selected_modes}
+        self.bits_dict = {mode: [] for mode in selected_modes}
         
-        self.fig, self.ax = plt.subplots(1, 1, layout="constrained")
+        # matplotlib is only imported by plotSNRBER, headless sweeps and worker processes never load it
+        self.fig, self.ax = None, None
         
         self.current_iter = 0
         self.max_iters = len(self.snr_test_range) * len(selected_modes)
@@ -76,48 +287,183 @@ class SNRBERTest:
             self.selected_channels = selected_channels
         elif channel_params and not selected_channels or not channel_params and selected_channels:
             raise ValueError("Both channel_params and selected_channels must be provided to apply additional channels.")
+        
+        # Built once, the sampling rate can differ between modes
+        self.channel_pipelines = {mode: Channel.ChannelPipeline(self.selected_channels, self.channel_params, self.modulators[mode].sampling_rate)
+                                  if self.selected_channels else None
+                                  for mode in selected_modes}
+
+    def simulateSNRBER(self,message=None):
+        """
+        Runs the BER vs SNR sweep without plotting and returns the BER values.
+
+        Parameters
+        ----------
+        message : str
+            The message to simulate. Not used in Monte-Carlo mode.
+
+        Returns
+        -------
+        ber_dict : dict of list of float
+            Dictionary of BER values for each modulation mode.
+        """
+        self.__simulateSNRBER(message)
+        return self.ber_dict
 
     def __simulateSNRBER(self,message):
-        comparison_string = array([int(bit) for bit in Modulator.msgchar2bit_static(message)])
+        if self.monte_carlo:
+            self.__simulateSNRBER_monte_carlo()
+            return
+        
+        comparison_string = Modulator.msg2bits_static(message)
+        
+        if self.parallel:
+            self.__simulateSNRBER_parallel(message, comparison_string)
+            return
+        
+        if self.batched:
+            self.__simulateSNRBER_batched(message, comparison_string)
+            return
         
         for mode in self.selected_modes:
             modulator = self.modulators[mode]
             demodulator = self.demodulators[mode]
             
-            bit_string = modulator.msgchar2bit(message)
+            bit_string = modulator.msg2bits(message)
             time_axis, modulated_signal = modulator.modulate(bit_string)
             self.modulated_signals[mode] = (time_axis, modulated_signal)
             
-            for snr in self.snr_test_range:
-                signal = modulated_signal
+            for snr_index, snr in enumerate(self.snr_test_range):
                 self.current_iter += 1
-                channel = self.channels[snr]
-                signal = channel.add_noise(signal)
+                error_bits = cell_ber(demodulator, modulated_signal, comparison_string, snr + modulator.snr_offset, cell_seed(self.seed, mode, snr_index),
+                                      self.channel_pipelines[mode])
+                self.ber_dict[mode].append(error_bits / len(bit_string))
+    
+    def __simulateSNRBER_batched(self, message, comparison_string):
+        """
+        Batched sweep. The noisy signals for a block of SNR values are generated in one array operation
+        from a single clean waveform, with the signal power computed once per block, and demodulated as one 2-D block.
+        """
+        for mode in self.selected_modes:
+            modulator = self.modulators[mode]
+            demodulator = self.demodulators[mode]
+            
+            bit_string = modulator.msg2bits(message)
+            time_axis, modulated_signal = modulator.modulate(bit_string)
+            self.modulated_signals[mode] = (time_axis, modulated_signal)
+            
+            # One noise stream per mode, continued across blocks so results do not depend on batch_memory
+            mode_index = list(Modulator.modulation_modes).index(mode)
+            rng = nprandom.default_rng(None if self.seed is None else nprandom.SeedSequence(self.seed, spawn_key=(mode_index,)))
+            rows = max(1, self.batch_memory // (modulated_signal.nbytes or 1))
+            
+            for start in range(0, len(self.snr_test_range), rows):
+                channel = Channel.BatchGWNChannel_dB(self.snr_test_range[start:start + rows] + modulator.snr_offset, seed=rng)
+                noisy_block = channel.add_noise(modulated_signal)
+                
+                if self.channel_pipelines[mode] is not None:
+                    noisy_block = self.channel_pipelines[mode].apply(noisy_block, rng=rng, inplace=True)
+                
+                demodulated_block = demodulator.demodulate_batch(noisy_block)
+                demodulated_bits = demodulator.decision_demapper(demodulated_block[:, :-(6*demodulator.symbol_step)])
+                error_bits = count_nonzero(comparison_string != demodulated_bits[:, :len(comparison_string)], axis=1)
                 
-                if self.selected_channels:
-                    signal = Channel.ApplyChannels(self.selected_channels, self.channel_params, signal, modulator.sampling_rate)
+                self.current_iter += len(noisy_block)
+                self.ber_dict[mode].extend(error_bits / len(bit_string))
+    
+    def __simulateSNRBER_monte_carlo(self):
+        """
+        Monte-Carlo sweep. Each (mode, SNR) cell accumulates random bit blocks until the target error count
+        or the bit budget is reached, then reports the BER with its Wilson confidence interval.
+        """
+        settings = (self.target_errors, self.max_bits, self.batch_bits)
+        results = {mode: [None] * len(self.snr_test_range) for mode in self.selected_modes}
+        
+        if self.parallel:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {}
+                for mode in self.selected_modes:
+                    for snr_index, snr in enumerate(self.snr_test_range):
+                        future = executor.submit(_parallel_monte_carlo_cell, mode, self.bit_rate, self.carrier_freq, self.sampling_rate, self.baseband,
+                                                 self.samples_per_symbol, snr, self.seed, snr_index, *settings, self.channel_pipelines[mode])
+                        futures[future] = (mode, snr_index)
+                
+                for future in as_completed(futures):
+                    mode, snr_index = futures[future]
+                    self.current_iter += 1
+                    results[mode][snr_index] = future.result()
+        else:
+            for mode in self.selected_modes:
+                for snr_index, snr in enumerate(self.snr_test_range):
+                    self.current_iter += 1
+                    results[mode][snr_index] = monte_carlo_cell(self.modulators[mode], self.demodulators[mode],
+                                                                snr, self.seed, mode, snr_index, *settings, self.channel_pipelines[mode])
+        
+        for mode in self.selected_modes:
+            self.ber_dict[mode] = [error_bits / total_bits for error_bits, total_bits in results[mode]]
+            self.ber_ci_dict[mode] = [wilson_interval(error_bits, total_bits) for error_bits, total_bits in results[mode]]
+            self.bits_dict[mode] = [total_bits for _, total_bits in results[mode]]
+    
+    def __simulateSNRBER_parallel(self, message, comparison_string):
+        """
+        Fans every (mode, SNR) cell out to a process pool. The modulated waveform of each mode and the
+        comparison bits are placed in shared memory once and attached to by the workers.
+        """
+        shared_blocks = []
+        try:
+            comparison_block, comparison_spec = _to_shared(comparison_string)
+            shared_blocks.append(comparison_block)
+            
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {}
+                bit_lengths = {}
+                for mode in self.selected_modes:
+                    modulator = self.modulators[mode]
                     
-                demodulated_signal = demodulator.demodulate(signal)
-                demodulated_bits = demodulator.demapping(demodulated_signal)[1]
-                error_bits = sum(abs(comparison_string - demodulated_bits[:len(comparison_string)]))
-                self.ber_dict[mode].append(error_bits / len(bit_string))
+                    bit_string = modulator.msg2bits(message)
+                    bit_lengths[mode] = len(bit_string)
+                    time_axis, modulated_signal = modulator.modulate(bit_string)
+                    self.modulated_signals[mode] = (time_axis, modulated_signal)
+                    
+                    signal_block, signal_spec = _to_shared(modulated_signal)
+                    shared_blocks.append(signal_block)
+                    self.ber_dict[mode] = [None] * len(self.snr_test_range)
+                    
+                    for snr_index, snr in enumerate(self.snr_test_range):
+                        future = executor.submit(_parallel_cell, mode, self.bit_rate, self.carrier_freq, modulator.sampling_rate, self.baseband, signal_spec, comparison_spec,
+                                                 snr + modulator.snr_offset, cell_seed(self.seed, mode, snr_index), self.channel_pipelines[mode])
+                        futures[future] = (mode, snr_index)
                 
+                for future in as_completed(futures):
+                    mode, snr_index = futures[future]
+                    self.current_iter += 1
+                    self.ber_dict[mode][snr_index] = future.result() / bit_lengths[mode]
+        finally:
+            for block in shared_blocks:
+                block.close()
+                block.unlink()
                 
-    def plotSNRBER(self,message):
+    def plotSNRBER(self,message=None):
         """
         Plots the BER against SNR for the given message.
 
         Parameters
         ----------
         message : str
-            The message to simulate.
+            The message to simulate. Not used in Monte-Carlo mode.
 
         Returns
         -------
         fig : matplotlib.figure.Figure
             The figure object of the BER vs SNR plot.
         """
-        self.__simulateSNRBER(message)
+        from matplotlib import pyplot as plt
+        from matplotlib.ticker import MultipleLocator
+        
+        self.simulateSNRBER(message)
+        
+        if self.fig is None:
+            self.fig, self.ax = plt.subplots(1, 1, layout="constrained")
         
         # Scales and tickers
         self.ax.set_yscale('symlog', linthresh=1e-5)
@@ -136,6 +482,9 @@ class SNRBERTest:
 
         for modulation_type, color, marker in zip(self.selected_modes, colors, markers):
             self.ax.plot(self.snr_test_range, self.ber_dict[modulation_type], label=modulation_type, color=color, marker=marker)
+            if self.monte_carlo:
+                lower, upper = zip(*self.ber_ci_dict[modulation_type])
+                self.ax.fill_between(self.snr_test_range, lower, upper, color=color, alpha=0.2)
         
         self.ax.set_xlabel('SNR (dB)')
         self.ax.set_ylabel('BER')
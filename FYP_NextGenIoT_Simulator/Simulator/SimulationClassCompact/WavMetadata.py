@@ -0,0 +1,78 @@
+import struct
+
+# Simulation parameters are stored as 'key=value;...' in the ICMT field of a LIST/INFO chunk,
+# which scipy.io.wavfile and audio tools skip when reading the samples
+METADATA_FIELD = b'ICMT'
+
+def write_metadata(filename, metadata):
+    """
+    Appends the simulation parameters to an existing .wav file as a LIST/INFO chunk.
+
+    Parameters:
+        filename (str): The .wav file written by scipy.io.wavfile.write.
+        metadata (dict): Parameters to store, e.g. carrier_freq, sampling_rate, bit_rate. Values are stored as text.
+    """
+    text = ';'.join(f'{key}={value}' for key, value in metadata.items()).encode('ascii') + b'\x00'
+    text += b'\x00' * (len(text) % 2)
+    info = b'INFO' + METADATA_FIELD + struct.pack('<I', len(text)) + text
+    chunk = b'LIST' + struct.pack('<I', len(info)) + info
+
+    with open(filename, 'r+b') as file:
+        file.seek(0, 2)
+        file.write(chunk)
+        riff_size = file.tell() - 8
+        file.seek(4)
+        file.write(struct.pack('<I', riff_size))
+
+def read_metadata(filename):
+    """
+    Reads the simulation parameters written by `write_metadata`.
+
+    Parameters:
+        filename (str): The .wav file to be read.
+
+    Returns:
+        dict: The stored parameters, numbers are returned as int or float. Empty if the file has none.
+    """
+    metadata = {}
+    with open(filename, 'rb') as file:
+        riff, riff_size, wave = struct.unpack('<4sI4s', file.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f"Not a WAV file: {filename}")
+
+        while file.tell() < riff_size + 8:
+            header = file.read(8)
+            if len(header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id != b'LIST':
+                file.seek(chunk_size + chunk_size % 2, 1)
+                continue
+
+            info = file.read(chunk_size)
+            file.seek(chunk_size % 2, 1)
+            if info[:4] != b'INFO':
+                continue
+            position = 4
+            while position + 8 <= len(info):
+                field_id, field_size = struct.unpack('<4sI', info[position:position + 8])
+                if field_id == METADATA_FIELD:
+                    metadata.update(_parse(info[position + 8:position + 8 + field_size]))
+                position += 8 + field_size + field_size % 2
+    return metadata
+
+def _parse(text):
+    metadata = {}
+    for item in text.rstrip(b'\x00').decode('ascii').split(';'):
+        key, _, value = item.partition('=')
+        if not key:
+            continue
+        for convert in (int, float):
+            try:
+                metadata[key] = convert(value)
+                break
+            except ValueError:
+                pass
+        else:
+            metadata[key] = value
+    return metadata
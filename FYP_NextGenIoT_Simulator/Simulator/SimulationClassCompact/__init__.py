@@ -4,7 +4,12 @@ This package contains the simulation classes for the NextGen IoT Simulator.
 Classes are stored in the following modules:
 - ModulationClass: Contains the Modulator class for modulation simulation.
 - DemodulationClass: Contains the Demodulator class for demodulation simulation.
+- DemodulationPlots: Contains the plotting mixin of the Demodulator, matplotlib is imported on first use.
 - ChannelClass: Contains the Channel class for channel simulation.
+- ConstellationRegistry: Contains the process-wide QAM constellation tables shared by the Modulator and Demodulator.
+- PulseShaping: Contains the vectorised pulse shaping engine used by the Modulator and the decimating matched filter used by the Demodulator.
+- NCO: Contains the cached carrier phasor generator shared by the Modulator, Demodulator and channels.
+- WavMetadata: Contains the reader and writer of the carrier and rate metadata stored in saved .wav files.
 
 Classes are non CLI and ready for Import
 """
\ No newline at end of file
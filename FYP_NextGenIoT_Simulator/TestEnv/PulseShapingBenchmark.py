@@ -0,0 +1,72 @@
+import numpy as np
+import time
+import sys; import os; sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Simulator.SimulationClassCompact.ModulationClass import Modulator
+from Simulator.SimulationClassCompact.RRCFilter import RRCFilter
+from Simulator.SimulationClassCompact.PulseShaping import PulseShaper, select_method
+
+# Parameters
+BIT_RATES = [160000, 144000]  # At 144 kbps the RRC length is not a multiple of the samples per symbol
+CARRIER_FREQ = 200000
+NUM_SYMBOLS = 50000
+
+np.random.seed(1337)  # For reproducibility
+
+# Previous implementation of Modulator.__modulator_calculations pulse shaping
+def LUT_loop_shaper(impulses, rrc, samples_per_symbol):
+    shaped_pulse_length = len(impulses) * samples_per_symbol + len(rrc) - 1
+    unique_impulses, unique_indices = np.unique(impulses, return_inverse=True)
+    pulseLUT = unique_impulses[:, None] * rrc
+
+    Shaped_Pulse = np.zeros(shaped_pulse_length, dtype=complex)
+    for idx, impulse_idx in enumerate(unique_indices):
+        start_idx = idx * samples_per_symbol
+        Shaped_Pulse[start_idx:start_idx + len(rrc)] += pulseLUT[impulse_idx]
+
+    return Shaped_Pulse
+
+def random_symbols(order, num_symbols):
+    if order == 1:
+        return np.random.choice([-1, 1], size=num_symbols) + 0j
+    levels = np.arange(-(2**(order//2)) + 1, 2**(order//2), 2)
+    return np.random.choice(levels, size=num_symbols) + 1j * np.random.choice(levels, size=num_symbols)
+
+print("Running benchmarks...")
+print(f"{'Rate':<8}{'Mode':<8}{'SPS':>6}{'Loop (s)':>12}{'Polyphase (s)':>15}{'FFT (s)':>10}{'Auto':>11}{'Speedup':>9}{'Max Diff':>12}")
+
+for BIT_RATE, (mode, order) in [(bit_rate, item) for bit_rate in BIT_RATES for item in Modulator.modulation_modes.items()]:
+    modulator = Modulator(mode, BIT_RATE, CARRIER_FREQ)
+    samples_per_symbol = int(modulator.symbol_period * modulator.sampling_rate)
+    RRC_delay = 3 * modulator.symbol_period
+    _, rrc = RRCFilter(
+        N=int(2*modulator.sampling_rate*RRC_delay),
+        alpha=modulator.RRC_alpha,
+        Ts=modulator.symbol_period,
+        Fs=modulator.sampling_rate
+    )
+    impulses = random_symbols(order, NUM_SYMBOLS)
+
+    start_time = time.time()
+    Shaped_Pulse_Loop = LUT_loop_shaper(impulses, rrc, samples_per_symbol)
+    loop_time = time.time() - start_time
+
+    start_time = time.time()
+    Shaped_Pulse_Poly = PulseShaper(impulses, rrc, samples_per_symbol, method='polyphase')
+    poly_time = time.time() - start_time
+
+    start_time = time.time()
+    Shaped_Pulse_FFT = PulseShaper(impulses, rrc, samples_per_symbol, method='fft')
+    fft_time = time.time() - start_time
+
+    expected_length = len(impulses) * samples_per_symbol + len(rrc) - 1
+    assert len(Shaped_Pulse_Loop) == len(Shaped_Pulse_Poly) == len(Shaped_Pulse_FFT) == expected_length, \
+        f"Length mismatch: loop {len(Shaped_Pulse_Loop)}, polyphase {len(Shaped_Pulse_Poly)}, fft {len(Shaped_Pulse_FFT)}, expected {expected_length}"
+
+    auto = select_method(len(impulses), len(rrc), samples_per_symbol)
+    auto_time = poly_time if auto == 'polyphase' else fft_time
+    difference = max(np.max(np.abs(Shaped_Pulse_Loop - Shaped_Pulse_Poly)), np.max(np.abs(Shaped_Pulse_Loop - Shaped_Pulse_FFT)))
+
+    print(f"{BIT_RATE:<8}{mode:<8}{samples_per_symbol:>6}{loop_time:>12.4f}{poly_time:>15.4f}{fft_time:>10.4f}{auto:>11}{loop_time/auto_time:>8.1f}x{difference:>12.2e}")
+
+    del Shaped_Pulse_Loop, Shaped_Pulse_Poly, Shaped_Pulse_FFT
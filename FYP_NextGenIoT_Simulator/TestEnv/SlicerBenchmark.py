@@ -0,0 +1,35 @@
+import numpy as np
+import time
+import sys; import os; sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Simulator.SimulationClassCompact.ConstellationRegistry import QAM_MODES, get_constellation
+
+# Parameters
+NUM_SYMBOLS = int(1e6)
+NOISE_STD = 0.4  # Per component, on the un-normalised grid (points 2 apart)
+
+np.random.seed(1337)  # For reproducibility
+
+print("Running benchmarks...")
+print(f"{'Mode':<8}{'KDTree (s)':>12}{'Slicer (s)':>12}{'Speedup':>9}{'Mismatches':>12}")
+
+for mode in QAM_MODES:
+    constellation = get_constellation(mode)
+    constellation.tree  # Build the tree outside the timed section
+
+    labels = np.random.randint(0, constellation.size, NUM_SYMBOLS)
+    received = constellation.points[labels] + NOISE_STD * (np.random.randn(NUM_SYMBOLS) + 1j * np.random.randn(NUM_SYMBOLS))
+    i_samples, q_samples = received.real, received.imag
+
+    start_time = time.time()
+    tree_labels = constellation.tree.query(np.stack([i_samples, q_samples], axis=-1))[1]
+    tree_bits = constellation.bits[tree_labels]
+    tree_time = time.time() - start_time
+
+    start_time = time.time()
+    slicer_labels = constellation.slice(i_samples, q_samples)
+    slicer_bits = constellation.bits[slicer_labels]
+    slicer_time = time.time() - start_time
+
+    mismatches = np.count_nonzero(np.any(tree_bits != slicer_bits, axis=1))
+    print(f"{mode:<8}{tree_time:>12.4f}{slicer_time:>12.4f}{tree_time/slicer_time:>8.1f}x{mismatches:>12}")